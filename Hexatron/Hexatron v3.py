@@ -4,16 +4,15 @@
 #
 # Author:      Ibrahim Haq
 # Created:     30-10-2020
-# Updated:     26-12-2022
+# Updated:     18-10-2026
 #-----------------------------------------------------------------------------
 #
 # Index:
-#   41-137      Variable and Dictionary initializations
-#   141-665     Function initializations
-#   670-809     First section of draw
-#   812-1402    Analyzing the game board and choosing from all possible moves
-#   1407-1484   Later section of draw
-#   1489-1685   Mouse up function, including player moving their pawns and pressing buttons
+#   40-162      Variable and Dictionary initializations
+#   164-692     Function initializations
+#   696-750     Computer's turn, looking up the game board and choosing from all possible moves
+#   752-930     Draw functions, displaying the current gamestate
+#   932-1051    Mouse and keyboard functions, including player moving their pawns and pressing buttons
 #
 #-----------------------------------------------------------------------------
 #
@@ -43,26 +42,26 @@
 
 
 
+import atexit
+import os
+import sys
 import pygame
-import random as rn
 import time as t
 
+from collections import OrderedDict
+from pgzero import ptext
 
-WIDTH = 750
-HEIGHT = 750
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from board import Position, bits
+from journal import PASS, Journal
+from matchbox import MatchboxStore
+from profiler import Profiler
+from states import lookup
 
-a1 = Rect((150,450), (150,150))         # Space a1 borders
-b1 = Rect((300,450), (150,150))         # Space b1 borders
-c1 = Rect((450,450), (150,150))         # Space c1 borders
 
-a2 = Rect((150,300), (150,150))         # Space a2 borders
-b2 = Rect((300,300), (150,150))         # Space a2 borders
-c2 = Rect((450,300), (150,150))         # Space a2 borders
-
-a3 = Rect((150,150), (150,150))         # Space a3 borders
-b3 = Rect((300,150), (150,150))         # Space b3 borders
-c3 = Rect((450,150), (150,150))         # Space b3 borders
+WIDTH = 750
+HEIGHT = 750
 
 
 TitleBx   = Rect((500,625), (150,100))  # Title button borders
@@ -76,65 +75,89 @@ SoundBx   = Rect((490,500), (85, 80))   # Sound toggle button borders
 YesBx     = Rect((240,450), (85,80))    # Yes button borders
 NoBx      = Rect((440,450), (70,80))    # No button borders
 
+CELL      = 150                         # Size of a grid space, and of the buckets buttons are indexed in
+
+
+# Borders and centre coordinates of every grid space, by space number (0-8, from a1 to c3),
+# only used to draw the grid and pawns
+rects  = tuple(Rect((CELL * (1 + sp % 3), CELL * (3 - sp // 3)), (CELL, CELL)) for sp in range(9))
+spaces = tuple(r.center for r in rects)
+
 
 gs       = 'title'                      # Gamestate
-butn     = 0                            # Mouse button value
-mPos     = 0                            # Mouse position value
 pMove    = True                         # Control variable to check if player is moving
 cMove    = False                        # Control variable to check if computer is moving
 chosen   = False                        # Control variable to check if computer has chosen a move
-misclick = True                         # Control variable to prevent misclick errors
 stale    = False                        # Control variable checking for stalemate
 snd      = True                         # Control variable for toggling sound
 cause    = ''                           # Statement on win or lose screen that describes why player won/lost
-mvdSp    = 0                            # Space a pawn was moved to, for the purpose of updating wp[x]Sp
-mvdPos   = ()                           # New coordinates of a pawn, for the purpose of updating wp[x]Pos
 colour   = ''                           # Colour cooresponding to the move chosen
 indx     = 0                            # Index variable
 learning = 'fast'                       # AI's learning configuration, between fast or slow
+ai       = MatchboxStore()              # AI database, loaded once and kept in memory
+journal  = Journal()                    # Record of every game played, written out a batch at a time
+played   = []                           # Moves made this game, as (from, to) space numbers
+decided  = []                           # AI decisions made this game, as (line, colour)
+profile  = Profiler('HEXATRON_PROFILE' in os.environ)  # Frame timers, only on if HEXATRON_PROFILE is set
+overlay  = False                        # Control variable for showing the frame timers on the screen
 
+# The frame timers are written out when the game is closed
+if profile.on:
+    atexit.register(profile.dump, 'Profile.csv')
 
 
-wp1Pos    = (225,525)                   # Coordinates of wp1
-wp2Pos    = (375,525)                   # Coordinates of wp2
-wp3Pos    = (525,525)                   # Coordinates of wp3
-
-bp1Pos    = (225,225)                   # Coordinates of bp1
-bp2Pos    = (375,225)                   # Coordinates of bp2
-bp3Pos    = (525,225)                   # Coordinates of bp3
-
 
-# Dictionary containing spaces occupy by all pawns
-occupy  = {'wp1' : a1, 'wp2' : b1, 'wp3' : c1, 'bp1' : a3, 'bp2' : b3, 'bp3' : c3}
+# Dictionary containing the space number each pawn starts on, and the space each pawn is on
+home   = {'wp1' : 0, 'wp2' : 1, 'wp3' : 2, 'bp1' : 6, 'bp2' : 7, 'bp3' : 8}
+occupy = dict(home)
 
-# Dictionary containing coordinates of all the grid space (for pawn positioning)
-spaces = {'a1' : (225,525), 'b1' : (375,525), 'c1' : (525,525),
-          'a2' : (225,375), 'b2' : (375,375), 'c2' : (525,375),
-          'a3' : (225,225), 'b3' : (375,225), 'c3' : (525,225)}
+# Bitboard of the spaces occupied by white team and black team
+brd = Position()
 
-# Dictionaries containins spaces occupied by white team and black team
-wOcc = occupy.copy()
-bOcc = occupy.copy()
+# Dictionary containing the statement on the win or lose screen for each way the game ends
+causes = {('w', 'captured') : 'all pawns captured',
+          ('w', 'reached')  : 'you reached other side',
+          ('b', 'captured') : 'all pawns captured',
+          ('b', 'reached')  : 'AI reached other side'}
 
 # Dictionary checking if a pawn is captured or not
 captured = {'wp1' : False, 'wp2' : False, 'wp3' : False, 'bp1' : False, 'bp2' : False, 'bp3' : False}
 
-# Dictionary checking if a space is a valid option to move to
-valid = {'a1' : False, 'a2' : False, 'a3' : False,
-         'b1' : False, 'b2' : False, 'b3' : False,
-         'c1' : False, 'c2' : False, 'c3' : False}
+# List checking if a space is a valid option to move to, by space number
+valid = [False] * 9
 
 # Dictionary checking if a pawn is selected
 selected = {'wp1' : False, 'wp2' : False, 'wp3' : False}
 
 
-wp1 = Actor('wp', wp1Pos)               # Player's first pawn    (White Pawn 1)
-wp2 = Actor('wp', wp2Pos)               # Player's second pawn   (White Pawn 2)
-wp3 = Actor('wp', wp3Pos)               # Player's third pawn    (White Pawn 3)
+wp1 = Actor('wp', spaces[0])            # Player's first pawn    (White Pawn 1)
+wp2 = Actor('wp', spaces[1])            # Player's second pawn   (White Pawn 2)
+wp3 = Actor('wp', spaces[2])            # Player's third pawn    (White Pawn 3)
+
+bp1 = Actor('bp', spaces[6])            # Computer's first pawn  (Black Pawn 1)
+bp2 = Actor('bp', spaces[7])            # Computer's second pawn (Black Pawn 2)
+bp3 = Actor('bp', spaces[8])            # Computer's third pawn  (Black Pawn 3)
+
+# Dictionary containing every pawn's actor
+actors = {'wp1' : wp1, 'wp2' : wp2, 'wp3' : wp3, 'bp1' : bp1, 'bp2' : bp2, 'bp3' : bp3}
+
+# Dictionary containing the buttons of every gamestate, by (gamestate, x // CELL, y // CELL)
+hits = {}
 
-bp1 = Actor('bp', bp1Pos)               # Computer's first pawn  (Black Pawn 1)
-bp2 = Actor('bp', bp2Pos)               # Computer's second pawn (Black Pawn 2)
-bp3 = Actor('bp', bp3Pos)               # Computer's third pawn  (Black Pawn 3)
+# Dictionary containing pawn images already scaled by fit, by (image, size change)
+sprites = {}
+
+board = None                            # Empty board (grid and coordinates), drawn once by bake
+glow  = None                            # Highlight of a grid space that can be moved to, drawn once by bake
+
+shown = None                            # (gs, learning, snd, cause) of the screen last drawn in full
+looks = []                              # What each grid space showed when it was last drawn, by space number
+
+# Text already rendered by write, by (string, font size, font, colour), least recently used first
+labels   = OrderedDict()
+labelMax = 128                          # Most rendered labels kept before the oldest is dropped
+font     = "paper flowers"              # Font used for all text
+ink      = (0)                          # Colour used for all text
 
 
 
@@ -157,7 +180,21 @@ def write(wd, xy, fs):
        xy = coordinates tuple
        fs = font size
        '''
-    screen.draw.text(wd, xy, color = (0), fontsize = fs, fontname = "paper flowers")
+    
+    key = (wd, fs, font, ink)
+    
+    with profile('text'):
+        
+        if key in labels:
+            labels.move_to_end(key)
+        
+        else:
+            labels[key] = ptext.getsurf(wd, fontname = font, fontsize = fs, color = ink)
+            
+            if len(labels) > labelMax:
+                labels.popitem(last = False)
+        
+        screen.blit(labels[key], xy)
 
 
 
@@ -167,7 +204,7 @@ def reset():
     global valid
     global selected
     
-    for x in valid:
+    for x in range(9):
         valid[x] = False
     
     for x in selected:
@@ -175,32 +212,59 @@ def reset():
 
 
 
-def click(g, b):
-    '''Checks to see if a button is clicked during a particular gamestate
-        
-        Parameters:
-        
-        g = gamestate during which the button is pressed
-        b = button in question
-        
-        Returns:
-        True or false depending on if the button is clicked in the specified gamestate
+def cell(xy):
+    '''Finds the grid space under a point, by dividing by the size of a space
+    
+       Parameters:
+       xy = coordinates tuple
+       
+       Returns:
+       Space number, or None if the point is off the grid
     '''
     
-    global butn
-    global mPos
-    global gs
+    col = xy[0] // CELL - 1
+    row = 3 - xy[1] // CELL
     
-    if gs == g and butn == mouse.LEFT:
-        
-        if b.collidepoint(mPos):
-            return True
-        
-        else:
-            return False
-        
-    else:
-        return False
+    if 0 <= col < 3 and 0 <= row < 3:
+        return col + 3 * row
+    
+    return None
+
+
+
+def register(g, b, action):
+    '''Adds a button to the hit-test index
+    
+       The button is filed under every CELL sized bucket of the screen it
+       overlaps, so finding it again only looks at the buttons in one bucket
+       
+       Parameters:
+       g      = gamestate during which the button can be pressed
+       b      = button borders
+       action = function called (with no parameters) when the button is pressed
+    '''
+    
+    for x in range(b.left // CELL, (b.right - 1) // CELL + 1):
+        for y in range(b.top // CELL, (b.bottom - 1) // CELL + 1):
+            hits.setdefault((g, x, y), []).append((b, action))
+
+
+
+def hit(xy):
+    '''Finds the button that was clicked in the current gamestate
+    
+       Parameters:
+       xy = coordinates of the click
+       
+       Returns:
+       The action of the button, or None if no button was clicked
+    '''
+    
+    for b, action in hits.get((gs, xy[0] // CELL, xy[1] // CELL), ()):
+        if b.collidepoint(xy):
+            return action
+    
+    return None
 
 
 
@@ -229,219 +293,213 @@ def inflate(actorIn, xIncrease): # Original function created by Mr. Brooks, slig
 
 
 
+def fit(actorIn, xIncrease):
+    '''Resizes an actor with inflate, scaling each image only once
+    
+       Parameters:
+       actorIn   = The actor to work with
+       xIncrease = The amount (in pixels) to increase the width by, use a negative number to shrink
+       
+       Returns:
+       The resized actor object
+    '''
+    
+    key = (actorIn.image, xIncrease)
+    
+    if key not in sprites:
+        sprites[key] = inflate(actorIn, xIncrease)._surf
+        
+    elif actorIn._surf is not sprites[key]:
+        oldLocation = actorIn.center
+        actorIn._surf = sprites[key]
+        actorIn._update_pos()
+        actorIn.center = oldLocation
+    
+    return actorIn
+
+
+
 def pawn():
     '''Handles display of pawns'''
     
-    global wp1Pos
-    global wp2Pos
-    global wp3Pos
-    global bp1Pos
-    global bp2Pos
-    global bp3Pos
     global captured
     
-    wp1 = Actor('wp', wp1Pos)
-    wp2 = Actor('wp', wp2Pos)
-    wp3 = Actor('wp', wp3Pos)
-    bp1 = Actor('bp', bp1Pos)
-    bp2 = Actor('bp', bp2Pos)
-    bp3 = Actor('bp', bp3Pos)
-    
-    wp1 = inflate(wp1, -2250)
-    wp2 = inflate(wp2, -2250)
-    wp3 = inflate(wp3, -2250)
-    bp1 = inflate(bp1, -2250)
-    bp2 = inflate(bp2, -2250)
-    bp3 = inflate(bp3, -2250)
-    
-    if captured['wp1'] == False:
-        wp1.draw()
+    with profile('pawn'):
         
-    if captured['wp2'] == False:
-        wp2.draw()
+        for pwn, actor in actors.items():
+            
+            fit(actor, -2250)
+            actor.center = spaces[occupy[pwn]]
+            
+            if captured[pwn] == False:
+                actor.draw()
+
+
+
+def bake():
+    '''Draws the empty board and a highlighted grid space once, off the screen'''
+    
+    global board
+    global glow
     
-    if captured['wp3'] == False:
-        wp3.draw()
+    board = pygame.Surface((WIDTH, HEIGHT))
+    board.fill((255,255,255))
     
-    if captured['bp1'] == False:
-        bp1.draw()
+    for r in rects:
+        pygame.draw.rect(board, (0), r, 1)
     
-    if captured['bp2'] == False:
-        bp2.draw()
+    for wd, xy in (('1', (100,475)), ('2', (100,325)), ('3', (100,175)),
+                   ('A', (210,50)),  ('B', (360,50)),  ('C', (510,50))):
+        board.blit(ptext.getsurf(wd, fontname = font, fontsize = 100, color = ink), xy)
     
-    if captured['bp3'] == False:
-        bp3.draw()
+    glow = pygame.Surface((150,150))
+    glow.fill((0,160,220))
 
 
 
 def grid():
     '''Handles display of grid'''
     
-    global valid   
+    global valid
     
-    if valid['a1'] == False:
-        screen.draw.rect(a1, color=(0))
-    elif valid['a1']:
-        screen.draw.filled_rect(a1, color=(0,160,220))
+    with profile('grid'):
+        
+        if board is None:
+            bake()
+        
+        screen.blit(board, (0,0))
+        
+        for sp in range(9):
+            if valid[sp]:
+                screen.blit(glow, rects[sp].topleft)
+
 
-    if valid['b1'] == False:
-        screen.draw.rect(b1, color=(0))
-    elif valid['b1']:
-        screen.draw.filled_rect(b1, color=(0,160,220))
+
+def look(sp):
+    '''Finds what a grid space currently shows
     
-    if valid['c1'] == False:
-        screen.draw.rect(c1, color=(0))
-    elif valid['c1']:
-        screen.draw.filled_rect(c1, color=(0,160,220))
+       Parameters:
+       sp = Space number
+       
+       Returns:
+       (highlighted, pawn) tuple, where pawn is the name of the pawn on the space or None
+    '''
     
+    for pwn in occupy:
+        if not captured[pwn] and occupy[pwn] == sp:
+            return valid[sp], pwn
     
-    if valid['a2'] == False:
-        screen.draw.rect(a2, color=(0))
-    elif valid['a2']:
-        screen.draw.filled_rect(a2, color=(0,160,220))
+    return valid[sp], None
+
+
+
+def space(sp):
+    '''Draws a single grid space again, with the pawn on it
+    
+       Parameters:
+       sp = Space number
+    '''
     
-    if valid['b2'] == False:
-        screen.draw.rect(b2, color=(0))
-    elif valid['b2']:
-        screen.draw.filled_rect(b2, color=(0,160,220))
+    global looks
     
-    if valid['c2'] == False:
-        screen.draw.rect(c2, color=(0))
-    elif valid['c2']:
-        screen.draw.filled_rect(c2, color=(0,160,220))
+    looks[sp] = look(sp)
+    highlit, pwn = looks[sp]
     
+    screen.surface.blit(board, rects[sp].topleft, rects[sp])
     
-    if valid['a3'] == False:
-        screen.draw.rect(a3, color=(0))
-    elif valid['a3']:
-        screen.draw.filled_rect(a3, color=(0,160,220))
+    if highlit:
+        screen.blit(glow, rects[sp].topleft)
     
-    if valid['b3'] == False:
-        screen.draw.rect(b3, color=(0))
-    elif valid['b3']:
-        screen.draw.filled_rect(b3, color=(0,160,220))
-        
-    if valid['c3'] == False:
-        screen.draw.rect(c3, color=(0))
-    elif valid['c3']:
-        screen.draw.filled_rect(c3, color=(0,160,220))
+    if pwn:
+        actor = fit(actors[pwn], -2250)
+        actor.center = spaces[sp]
+        actor.draw()
         
         
         
-def moveW():
-    '''Handles movement of white pawns'''
+def moveW(sp):
+    '''Handles the player selecting, cancelling and moving their pawns
+    
+       Parameters:
+       sp = Space number that was clicked, None if the click was off the grid
+       
+       Returns:
+       True if a pawn was moved
+    '''
     
     global selected
-    global mvdSp
-    global mvdPos
-    global spaces
-    global misclick
-    global snd
+    global occupy
+    global brd
     
-    misclick = False
+    picked = [pwn for pwn in selected if selected[pwn]]
     
-    if click('play', a2) and valid['a2']:
     
-        mvdPos = spaces['a2']
-        mvdSp  = a2
+    # A pawn is selected
+    if not picked:
         
-    elif click('play', b2) and valid['b2']:
+        for pwn in selected:
+            if not captured[pwn] and occupy[pwn] == sp:
+                selected[pwn] = True
+                validate(pwn)
         
-        mvdPos = spaces['b2']
-        mvdSp  = b2
+        return False
     
-    elif click('play', c2) and valid['c2']:
-        
-        mvdPos = spaces['c2']
-        mvdSp  = c2
-        
-    elif click('play', a3) and valid['a3']:
-        
-        mvdPos = spaces['a3']
-        mvdSp  = a3
     
-    elif click('play', b3) and valid['b3']:
-        
-        mvdPos = spaces['b3']
-        mvdSp  = b3
-        
-    elif click('play', c3) and valid['c3']:
-        
-        mvdPos = spaces['c3']
-        mvdSp  = c3
+    # Movement is cancelled, by clicking anywhere a pawn can't move to
+    if sp is None or not valid[sp]:
+        reset()
+        return False
     
-    else:
-        misclick = True
-        
+    
+    # The pawn is moved
+    pwn = picked[0]
     reset()
-    if not misclick and snd:
+    
+    if snd:
         sounds.pawn.play()
     
+    played.append((occupy[pwn], sp))
+    brd = brd.play(occupy[pwn], sp)
+    occupy[pwn] = sp
     
+    capture('w')
+    turn()
     
-def moveB(pwn,sp,spR):
+    return True
+    
+    
+    
+def moveB(pwn,sp):
     '''Handles movement of black pawns
 
        Parameters:
        pwn = Pawn to be moved
-       sp  = Space pawn is being moved to (String notation)
-       spR = Space pawn is being moved to (Rect notation)       
+       sp  = Space number pawn is being moved to
     '''
-              
-    global spaces
-    global occupy
-    
-    global bp1Pos
-    global bp2Pos
-    global bp3Pos
     
+    global occupy
+    global brd
     
-    if pwn == 'bp1':
-        bp1Pos = spaces[sp]
-        occupy[pwn] = spR
-        
-    elif pwn == 'bp2':
-        bp2Pos = spaces[sp]
-        occupy[pwn] = spR
-        
-    elif pwn == 'bp3':
-        bp3Pos = spaces[sp]
-        occupy[pwn] = spR
+    played.append((occupy[pwn], sp))
+    brd = brd.play(occupy[pwn], sp)
+    occupy[pwn] = sp
 
 
 
-def setOcc():
-    '''Updates the wOcc and bOcc dictionaries'''
+def pawnAt(sp):
+    '''Finds the black pawn on a grid space
     
-    global wOcc
-    global bOcc
-    global occupy
-    global captured
+       Parameters:
+       sp = Space number
+       
+       Returns:
+       Name of the pawn
+    '''
     
-    wOcc = occupy.copy()
-    wOcc.pop('bp1')
-    wOcc.pop('bp2')
-    wOcc.pop('bp3')
-    
-    if captured['wp1']:
-        wOcc.pop('wp1')
-    if captured['wp2']:
-        wOcc.pop('wp2')
-    if captured['wp3']:
-        wOcc.pop('wp3')
+    for pwn in ('bp1', 'bp2', 'bp3'):
+        if not captured[pwn] and occupy[pwn] == sp:
+            return pwn
         
-    bOcc = occupy.copy()
-    bOcc.pop('wp1')
-    bOcc.pop('wp2')
-    bOcc.pop('wp3')
-
-    if captured['bp1']:
-        bOcc.pop('bp1')
-    if captured['bp2']:
-        bOcc.pop('bp2')
-    if captured['bp3']:
-        bOcc.pop('bp3')
-    
         
         
 def capture(team):
@@ -453,35 +511,20 @@ def capture(team):
     
     global captured
     global occupy
-    global wOcc
-    global bOcc
-    
-    setOcc()
+    global brd
     
     if team == 'w':
-        
-        if occupy['bp1'] in wOcc.values():
-            captured['bp1'] = True
-        
-        if occupy['bp2'] in wOcc.values():
-            captured['bp2'] = True
-        
-        if occupy['bp3'] in wOcc.values():
-            captured['bp3'] = True
-    
+        enemy = ('bp1', 'bp2', 'bp3')
+        mask  = brd.black
     
     elif team == 'b':
-        
-        if occupy['wp1'] in bOcc.values():
-            captured['wp1'] = True
-            
-        if occupy['wp2'] in bOcc.values():
-            captured['wp2'] = True
-            
-        if occupy['wp3'] in bOcc.values():
-            captured['wp3'] = True
+        enemy = ('wp1', 'wp2', 'wp3')
+        mask  = brd.white
     
-    setOcc()
+    # A pawn is captured once its space is no longer held by its own team
+    for pwn in enemy:
+        if not captured[pwn] and not mask & (1 << occupy[pwn]):
+            captured[pwn] = True
             
             
             
@@ -490,9 +533,14 @@ def turn():
     
     global pMove
     global cMove
+    global brd
     
     pMove = not pMove
     cMove = not cMove
+    
+    # Only changes the board when a side had to pass, since moving already switches turns
+    if brd.turn != ('w' if pMove else 'b'):
+        brd = Position(brd.white, brd.black, 'w' if pMove else 'b')
             
             
             
@@ -505,59 +553,10 @@ def validate(pwn):
     
     global occupy
     global valid
-    global wOcc
-    global bOcc
+    global brd
     
-    setOcc()
-        
-    # Moving to empty spaces
-    
-    
-    if occupy[pwn] == a1 and a2 not in occupy.values():
-        valid['a2'] = True
-    
-    elif occupy[pwn] == b1 and b2 not in occupy.values():
-        valid['b2'] = True
-        
-    elif occupy[pwn] == c1 and c2 not in occupy.values():
-        valid['c2'] = True
-    
-    elif occupy[pwn] == a2 and a3 not in occupy.values():
-        valid['a3'] = True
-        
-    elif occupy[pwn] == b2 and b3 not in occupy.values():
-        valid['b3'] = True
-        
-    elif occupy[pwn] == c2 and c3 not in occupy.values():
-        valid['c3'] = True
-        
-    
-    # Capturing Pawns
-    
-    
-    if occupy[pwn] == a1 and b2 in bOcc.values() and b2 not in wOcc.values():
-        valid['b2'] = True
-        
-    if occupy[pwn] == b1 and a2 in bOcc.values() and a2 not in wOcc.values():
-        valid['a2'] = True
-    
-    if occupy[pwn] == b1 and c2 in bOcc.values() and c2 not in wOcc.values():
-        valid['c2'] = True
-        
-    if occupy[pwn] == c1 and b2 in bOcc.values() and b2 not in wOcc.values():
-        valid['b2'] = True
-        
-    if occupy[pwn] == a2 and b3 in bOcc.values() and b3 not in wOcc.values():
-        valid['b3'] = True
-        
-    if occupy[pwn] == b2 and a3 in bOcc.values() and a3 not in wOcc.values():
-        valid['a3'] = True
-    
-    if occupy[pwn] == b2 and c3 in bOcc.values() and c3 not in wOcc.values():
-        valid['c3'] = True
-        
-    if occupy[pwn] == c2 and b3 in bOcc.values() and b3 not in wOcc.values():
-        valid['b3'] = True
+    for to in bits(brd.reach(occupy[pwn])):
+        valid[to] = True
         
         
         
@@ -573,37 +572,21 @@ def choose(lst):
     global stale
     global chosen
     
-    stale = False
-    indx  = lst
-    f     = open("AI.txt")
-    x     = f.readlines()
-    f.close()
-    
-    colour = x[indx][rn.randint(0, len(x[indx])-1)]
-    while not colour.isalpha():
-        colour = x[indx][rn.randint(0, len(x[indx])-1)]
-    
+    stale  = False
+    indx   = lst
+    colour = ai.choose(indx)
     chosen = True
+    
+    decided.append((indx, colour))
         
         
         
 def stalemate():
     '''Checks to see if player is in a stalemate'''
     
-    global valid
     global stale
     
-    if not captured['wp1']:
-        validate('wp1')
-    if not captured['wp2']:
-        validate('wp2')
-    if not captured['wp3']:
-        validate('wp3')
-    
-    if True not in valid.values():
-        stale = True
-        
-    reset()
+    stale = brd.stuck()
     
     
     
@@ -614,55 +597,154 @@ def learn():
     global colour
     global learning
     
-    f = open("AI.txt")
-    x = []
-    n = 0
+    ai.learn(indx, colour, learning)
+    ai.flush()
+    
+    
+    
+def forget():
+    '''Wipes the AI's database'''
+    
+    ai.forget()
+    ai.flush()
+    
+    
+    
+def newGame():
+    '''Puts the pawns back and resets the board for a new game'''
+    
+    global stale
+    global pMove
+    global cMove
+    global occupy
+    global captured
+    global brd
+    global played
+    global decided
+    
+    reset()
+    stale = False
+    pMove = True
+    cMove = False
+    occupy   = dict(home)
+    captured = {'wp1' : False, 'wp2' : False, 'wp3' : False,
+                'bp1' : False, 'bp2' : False, 'bp3' : False}
+    brd      = Position()
+    played   = []
+    decided  = []
+    
     
-    while True:
-        x.append(list(f.readline()))
+    
+def go(state):
+    '''Switches gamestates, doing whatever has to happen on the way in
+    
+       Parameters:
+       state = gamestate to switch to (title, help, options, confirm, play, win or lose)
+    '''
+    
+    global gs
+    
+    if state == 'title':
+        newGame()
+    
+    elif state == 'play' and gs == 'title':
+        ai.refresh()
+    
+    gs = state
+    
+    
+    
+def over():
+    '''Checks if the game was won by capturing every pawn or reaching the other side
+    
+       Returns:
+       True if the game is over
+    '''
+    
+    global cause
+    
+    end = brd.outcome()
+    
+    if end and end[1] != 'stalemate':
         
-        if n > 25:
-            f.close()
-            break
+        if end[0] == 'w':
+            go('win')
+        elif end[0] == 'b':
+            go('lose')
         
-        if n == indx:
-            i = x[n].index(colour)
-            
-            if len(x[n]) > 1:
-                
-                if learning == 'fast':
-                    del x[indx][i]
-                elif learning == 'slow' and len(x[n]) < 10:
-                    x[indx].append(colour)
+        cause = causes[end]
+        return True
+    
+    return False
+    
+    
+    
+def logGame():
+    '''Adds the game that just finished to the game journal'''
+    
+    end = brd.outcome()
+    
+    if gs == 'win':
+        winner = 'w'
+    elif gs == 'lose':
+        winner = 'b'
+    
+    journal.record(winner, end[1] if end else 'stalemate', played, decided)
+    
+    
+    
+def computer():
+    '''Plays the computer's turn once the player has moved, then checks if the game is over'''
+    
+    global stale
+    global chosen
+    global cause
+    
+    if over():
+        logGame()
+        return
+    
+    
+    # Computer makes its move (refer to diagram of possible moves, listed in states.py)
+    with profile('ai'):
+        
+        stale  = True
+        chosen = False
+        state  = lookup(brd)
         
-        n += 1
+        if state:
+            choose(state[0])
+            
+            if colour in state[1]:
+                frm, to = state[1][colour]
+                moveB(pawnAt(frm), to)
+            else:
+                played.append(PASS)
     
-    f = open("AI.txt", "w")
-    f.write(''.join(x[0]))
-    f.close()
     
-    f = open("AI.txt", "a")
-    for n in x[1:]:
-        f.write(''.join(n))
-    f.close()
+    # Computer is put in stalemate
+    if stale:
+        go('win')
+        cause = '''AI is in stalemate'''
     
     
+    with profile('rules'):
+        capture('b')
+        turn()
+        stalemate()
     
-def forget():
-    '''Wipes the AI's database'''
     
-    f = open("AI Default.txt")
-    x = f.readlines()
-    f.close()
+    # Player is put in stalemate
+    if pMove and stale and gs == 'play':
+        go('lose')
+        cause = '''you are in stalemate'''
+    
     
-    f = open("AI.txt", "w")
-    f.write(''.join(x[0]))
-    f.close()
+    # Checking for victory or defeat
+    over()
     
-    f = open("AI.txt", "a")
-    for n in x[1:]:
-        f.write(''.join(n))
-    f.close()
+    if gs != 'play':
+        logGame()
     
         
     
@@ -672,55 +754,37 @@ def forget():
     
 
 
-def draw():
-    '''Function that runs continuously while the game is being played'''
+def paint():
+    '''Draws the current gamestate
+    
+       Only draws, everything that changes the game happens in on_mouse_up
+       and the functions it calls
+    '''
     
     
     # Initialization
     
     
-    clear()
+    global shown
+    global looks
     
-    global wp1Pos
-    global wp2Pos
-    global wp3Pos
-    global bp1Pos
-    global bp2Pos
-    global bp3Pos
     
-    global gs
-    global pMove
-    global cMove
-    global stale
-    global chosen
-    global cause
-    global learning
-    global snd
+    # Only the grid spaces that changed are drawn again, unless the whole screen changed
     
-    global occupy
-    global captured
-    global bOcc
-    global wOcc
-    global spaces
-    
-    global wp1
-    global wp2
-    global wp3
-    global bp1
-    global bp2
-    global bp3
-    
-    global a1
-    global a2
-    global a3
-    global b1
-    global b2
-    global b3
-    global c1
-    global c2
-    global c3
-    
-    setOcc()
+    
+    if (gs, learning, snd, cause) == shown:
+        
+        if gs == 'play':
+            with profile('cells'):
+                for sp in range(9):
+                    if look(sp) != looks[sp]:
+                        space(sp)
+        
+        return
+    
+    
+    shown = (gs, learning, snd, cause)
+    clear()
     
     
     # Title Screen
@@ -728,23 +792,6 @@ def draw():
     
     if gs == 'title':
         
-        wp1Pos = spaces['a1']  
-        wp2Pos = spaces['b1']    
-        wp3Pos = spaces['c1']             
-
-        bp1Pos = spaces['a3']
-        bp2Pos = spaces['b3']
-        bp3Pos = spaces['c3']
-        
-        reset()
-        stale = False
-        pMove = True
-        cMove = False
-        occupy   = {'wp1' : a1, 'wp2' : b1, 'wp3' : c1, 'bp1' : a3, 'bp2' : b3, 'bp3' : c3}
-        captured = {'wp1' : False, 'wp2' : False, 'wp3' : False,
-                    'bp1' : False, 'bp2' : False, 'bp3' : False}
-        
-        
         write('Hexatron', (235,100), 110)
         write('Start',    (310,300), 80)
         write('Help',     (320,450), 80)
@@ -814,645 +861,19 @@ def draw():
     
     elif gs == 'play':
         
-        
-        
-        
-        # Computer makes its move (refer to diagram of possible moves)
-        if cMove:
-            
-            stale = True
-            chosen = False
-        
-        
-            
-            
-            # Round 2 Move 1
-            if b1 in wOcc.values():
-                
-                # Straight
-                if c1 in wOcc.values() and a2 in wOcc.values():
-                    choose(0)
-                
-                    if colour == 'G':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'B':
-                        moveB('bp2', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp3', 'c2', c2)
-                
-                # Inverse
-                elif a1 in wOcc.values() and c2 in wOcc.values():
-                    choose(0)
-
-                    if colour == 'G':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'B':
-                        moveB('bp2', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp1', 'a2', a2)
-            
-            
-            
-            # Round 2 Move 2
-            if a1 in wOcc.values() and c1 in wOcc.values() and b2 in wOcc.values() and not chosen:
-                choose(1)
-                
-                if colour == 'G':
-                    moveB('bp1', 'a2', a2)
-                elif colour == 'B':
-                    moveB('bp1', 'b2', b2)
-                    
-                    
-                    
-            # Round 4 Move 1
-            if a1 in wOcc.values() and a2 in bOcc.values() and c2 in wOcc.values() and c3 in bOcc.values() and b2 in wOcc.values() and b3 in bOcc.values() and not chosen:
-                choose(2)
-            
-                if colour == 'P':
-                    moveB('bp2', 'c2', c2)
-                elif colour == 'G':
-                    moveB('bp3', 'b2', b2)
-            
-            
-            
-            # Round 4 Move 2
-            if b2 in bOcc.values() and b3 in bOcc.values() and captured['wp2'] and not chosen:
-                
-                # Straight
-                if a1 in wOcc.values() and c2 in wOcc.values() and c3 in bOcc.values():
-                    choose(3)
-                    
-                    if colour == 'G':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'B':
-                        moveB('bp1', 'a1', a1)
-                    elif colour == 'P':
-                        moveB('bp1', 'b1', b1)
-                    
-                # Inverse
-                elif c1 in wOcc.values() and a2 in wOcc.values() and a3 in wOcc.values():
-                    choose(3)
-                    
-                    if colour == 'G':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'B':
-                        moveB('bp1', 'a1', a1)
-                    elif colour == 'P':
-                        moveB('bp1', 'b1', b1)                    
-            
-            
-            
-            # Round 4 Move 3
-            if a2 in wOcc.values() and b3 in bOcc.values() and c2 in wOcc.values() and not chosen:
-                
-                # Straight 
-                if c1 in wOcc.values() and a3 in bOcc.values() and captured['bp3']:
-                    choose(4)
-                    
-                    if colour == 'P':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'G':
-                        moveB('bp2', 'b2', b2)
-                    elif colour == 'B':
-                        moveB('bp2', 'c3', c3)
-            
-                # Inverse
-                elif a1 in wOcc.values() and c3 in bOcc.values() and captured['bp1']:
-                    choose(4)
-                                        
-                    if colour == 'P':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'G':
-                        moveB('bp2', 'b2', b2)
-                    elif colour == 'B':
-                        moveB('bp2', 'c3', c3)
-            
-            
-            
-            # Round 4 Move 4
-            if a3 in bOcc.values() and c3 in bOcc.values() and captured['bp2'] and not chosen:
-                
-                # Straight
-                if c1 in wOcc.values() and a2 in wOcc.values():
-                    choose(5)
-                    
-                    if colour == 'R':
-                        moveB('bp3', 'c2', c2)
-                
-                elif a1 in wOcc.values() and c2 in wOcc.values():
-                    choose(5)
-                    
-                    if colour == 'R':
-                        moveB('bp1', 'a2', a2)
-                        
-            
-            
-            # Round 4 Move 5
-            if b2 in wOcc.values() and b3 in bOcc.values() and c1 in wOcc.values() and a2 in wOcc.values() and c2 in bOcc.values() and a3 in bOcc.values() and not chosen:
-                choose(6)
-            
-                if colour == 'B':
-                    moveB('bp2', 'a2', a2)
-                elif colour == 'P':
-                    moveB('bp1', 'b2', b2)
-                
-            
-            
-            # Round 4 Move 6
-            if b1 in wOcc.values() and b2 in wOcc.values() and a3 in bOcc.values() and c3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in wOcc.values():
-                    choose(7)
-                    
-                    if colour == 'B':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp3', 'c2', c2)
-                    
-                # Inverse
-                elif c2 in wOcc.values():
-                    choose(7)
-                    
-                    if colour == 'B':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp1', 'a2', a2)
-                        
-                        
-                        
-            # Round 4 Move 7          
-            if b2 in bOcc.values() and b3 in bOcc.values() and captured['wp2'] and not chosen:
-                
-                # Straight
-                if c1 in wOcc.values() and a2 in wOcc.values() and c3 in bOcc.values():
-                    choose(8)
-                    
-                    if colour == 'B':
-                        moveB('bp1', 'b1', b1)
-                    elif colour == 'R':
-                        moveB('bp1', 'c1', c1)
-                    elif colour == 'P':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'G':
-                        moveB('bp3', 'c2', c2)
-                    
-                # Inverse
-                elif a1 in wOcc.values() and c2 in wOcc.values() and a3 in bOcc.values():
-                    choose(8)
-                    
-                    if colour == 'B':
-                        moveB('bp3', 'b1', b1)
-                    elif colour == 'R':
-                        moveB('bp3', 'a1', a1)
-                    elif colour == 'P':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'G':
-                        moveB('bp1', 'a2', a2)
-
-
-            
-            # Round 4 Move 8
-            if b2 in wOcc.values() and b3 in bOcc.values() and not chosen:
-                
-                # Straight 1
-                if c1 in wOcc.values() and c3 in bOcc.values() and captured['bp1']:
-                    choose(9)
-                    
-                    if colour == 'P':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp3', 'c2', c2)
-                        
-                # Straight 2
-                elif a1 in wOcc.values() and c3 in bOcc.values() and captured['bp1']:
-                    choose(9)
-                    
-                    if colour == 'P':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp3', 'c2', c2)
-                        
-                # Inverse 1
-                elif a1 in wOcc.values() and a3 in bOcc.values() and captured['bp3']:
-                    choose(9)
-                    
-                    if colour == 'P':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp1', 'a2', a2)
-                
-                # Inverse 2
-                elif c1 in wOcc.values() and a3 in bOcc.values() and captured['bp3']:
-                    choose(9)
-                    
-                    if colour == 'P':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp1', 'a2', a2)
-            
-            
-            
-            # Round 4 Move 9
-            if b2 in wOcc.values() and a3 in bOcc.values() and c3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if c1 in wOcc.values() and a2 in bOcc.values() and captured['wp1']:
-                    choose(10)
-                    
-                    if colour == 'R':
-                        moveB('bp2', 'a1', a1)
-                    elif colour == 'G':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'B':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp3', 'c2', c2)
-                        
-                # Inverse
-                elif a1 in wOcc.values() and c2 in bOcc.values() and captured['wp3']:
-                    choose(10)
-                    
-                    if colour == 'R':
-                        moveB('bp2', 'c1', c1)
-                    elif colour == 'G':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'B':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp1', 'a2', a2)
-                        
-                        
-                        
-            # Round 4 Move 10
-            if b1 in wOcc.values() and a3 in bOcc.values() and c3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in bOcc.values() and c2 in wOcc.values() and captured['wp1']:
-                    choose (11)
-                    
-                    if colour == 'G':
-                        moveB('bp2', 'a1', a1)
-                    elif colour == 'B':
-                        moveB('bp2', 'b1', b1)
-                
-                # Inverse
-                elif c2 in bOcc.values() and a2 in wOcc.values() and captured['wp3']:
-                    choose(11)
-                    
-                    if colour == 'G':
-                        moveB('bp2', 'c1', c1)
-                    elif colour == 'B':
-                        moveB('bp2', 'b1', b1)
-                        
-                        
-                        
-            # Round 4 Move 11
-            if 2 in wOcc.values() and b3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a1 in wOcc.values() and c3 in bOcc.values() and captured['wp2'] and captured['bp1']:
-                    choose(12)
-                    
-                    if colour == 'R':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp3', 'c2', c2)
-                    
-                # Inverse
-                elif c1 in wOcc.values() and a3 in bOcc.values() and captured['wp2'] and captured ['bp3']:
-                    choose(12)
-                    
-                    if colour == 'R':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'P':
-                        moveB('bp1', 'a2', a2)
-                        
-                        
-                        
-            # Round 6 Move 1
-            if b2 in wOcc.values() and b3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in bOcc.values() and c2 in wOcc.values():
-                    choose(13)
-                    
-                    if colour == 'R':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'P':
-                        moveB('bp1', 'a1', a1)
-                
-                # Inverse
-                elif c2 in bOcc.values() and a2 in wOcc.values():
-                    choose(13)
-                    
-                    if colour == 'R':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'P':
-                        moveB('bp3', 'c1', c1)
-                        
-                        
-                        
-            # Round 6 Move 2
-            if b2 in wOcc.values() and a2 in bOcc.values() and a3 in bOcc.values() and not chosen:
-                choose(14)
-                
-                if colour == 'P':
-                    moveB('bp1', 'b2', b2)
-                elif colour == 'R':
-                    moveB('bp2', 'a1', a1)
-    
-            
-            
-            # Round 6 Move 3
-            if b2 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in bOcc.values() and c2 in wOcc.values() and a3 in bOcc.values():
-                    choose(15)
-                    
-                    if colour == 'B':
-                        moveB('bp2', 'a1', a1)
-                    elif colour == 'P':
-                        moveB('bp3', 'b1', b1)
-                        
-                # Inverse
-                elif c2 in bOcc.values() and a2 in wOcc.values() and c3 in bOcc.values():
-                    choose(15)
-                    
-                    if colour == 'B':
-                        moveB('bp2', 'c1', c1)
-                    elif colour == 'P':
-                        moveB('bp1', 'b1', b1)
-                
-            
-            
-            # Round 6 Move 4
-            if a2 in wOcc.values() and b2 in wOcc.values() and c2 in wOcc.values() and not chosen:
-                
-                # Straight
-                if a3 in bOcc.values() and captured['bp2'] and captured['bp3']:
-                    choose(16)
-                    
-                    if colour == 'B':
-                        moveB('bp1', 'b2', b2)
-                
-                # Inverse
-                elif c3 in bOcc.values() and captured['bp2'] and captured ['bp1']:
-                    choose(16)
-                    
-                    if colour == 'B':
-                        moveB('bp3', 'b2', b2)
-                        
-            
-            
-            # Round 6 Move 5
-            if b2 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in wOcc.values() and c2 in bOcc.values() and c3 in bOcc.values():
-                    choose(17)
-                    
-                    if colour == 'R':
-                        moveB('bp1', 'b1', b1)
-                    elif colour == 'G':
-                        moveB('bp2', 'c1', c1)
-                
-                # Inverse
-                elif c2 in wOcc.values() and a2 in bOcc.values() and a3 in bOcc.values():
-                    choose(17)
-                    
-                    if colour == 'R':
-                        moveB('bp3', 'b1', b1)
-                    elif colour == 'G':
-                        moveB('bp2', 'a1', a1)
-                
-            
-            
-            # Round 6 Move 6
-            if b2 in bOcc.values() and b3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in wOcc.values() and captured['wp3']:
-                    choose(18)
-                    
-                    if colour == 'G':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'P':
-                        if not captured['bp1']:
-                            moveB('bp1', 'b2', b2)
-                        elif not captured['bp3']:
-                            moveB('bp3', 'b2', b2)
-                    
-                # Inverse
-                elif c2 in wOcc.values() and captured['wp1']:
-                    choose(18)
-                    
-                    if colour == 'G':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'P':
-                        if not captured['bp3']:
-                            moveB('bp3', 'b2', b2)
-                        elif not captured['bp1']:
-                            moveB('bp1', 'b2', b2)
-                
-                
-                
-            # Round 6 Move 7
-            if b2 in wOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in bOcc.values() and c3 in bOcc.values():
-                    choose(19)
-                    
-                    if colour == 'P':
-                        if not captured['bp1']:
-                            moveB('bp1', 'a1', a1)
-                        elif not captured['bp2']:
-                            moveB('bp2', 'a1', a1)
-                    
-                    elif colour == 'R':
-                        moveB('bp3', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp3', 'c2', c2)
-                
-                # Inverse
-                if c2 in bOcc.values() and a3 in bOcc.values():
-                    choose(19)
-                    
-                    if colour == 'P':
-                        if not captured['bp3']:
-                            moveB('bp3', 'c1', c1)
-                        elif not captured['bp2']:
-                            moveB('bp2', 'c1', c1)
-                    
-                    elif colour == 'R':
-                        moveB('bp1', 'b2', b2)
-                    elif colour == 'G':
-                        moveB('bp1', 'a2', a2)
-                        
-                        
-                        
-            # Round 6 Move 8
-            if b2 in wOcc.values() and c2 in bOcc.values() and c3 in bOcc.values() and not chosen:
-                choose(20)
-                
-                if colour == 'G':
-                    moveB('bp3', 'b2', b2)
-                elif colour == 'B':
-                    moveB('bp2', 'c1', c1)
-            
-            
-            
-            # Round 6 Move 9
-            if b2 in wOcc.values() and b3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in wOcc.values() and c2 in bOcc.values() and captured['bp1']:
-                    choose(21)
-                    
-                    if colour == 'R':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'P':
-                        moveB('bp3', 'c1', c1)
-                        
-                # Inverse
-                elif c2 in wOcc.values() and a2 in bOcc.values() and captured['bp3']:
-                    choose(21)
-                    
-                    if colour == 'R':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'P':
-                        moveB('bp1', 'a1', a1)
-            
-            
-            
-            # Round 6 Move 10
-            if b2 in bOcc.values() and not chosen:
-                
-                # Straight
-                if a2 in bOcc.values() and c2 in wOcc.values() and c3 in bOcc.values() and captured['wp1']:
-                    choose(22)
-                    
-                    if colour == 'P':
-                        moveB('bp2', 'a1', a1)
-                    elif colour == 'R':
-                        moveB('bp1', 'b1', b1)
-                
-                # Inverse
-                elif c2 in bOcc.values() and a2 in wOcc.values() and a3 in bOcc.values() and captured['wp3']:
-                    choose(22)
-                    
-                    if colour == 'P':
-                        moveB('bp2', 'c1', c1)
-                    elif colour == 'R':
-                        moveB('bp3', 'b1', b1)
-            
-            
-            
-            # Round 6 Move 11
-            if b2 in bOcc.values() and b3 in bOcc.values() and not chosen:
-                
-                # Straight
-                if c2 in wOcc.values() and captured['wp1']:
-                    choose(23)
-                    
-                    if colour == 'P':
-                        moveB('bp2', 'c2', c2)
-                    elif colour == 'B':
-                        if not captured['bp1']:
-                            moveB('bp1', 'b1', b1)
-                        elif not captured['bp3']:
-                            moveB('bp3', 'b1', b1)
-                    
-                # Inverse
-                elif a2 in wOcc.values() and captured['wp3']:
-                    choose(23)
-                    
-                    if colour == 'P':
-                        moveB('bp2', 'a2', a2)
-                    elif colour == 'B':
-                        if not captured['bp3']:
-                            moveB('bp3', 'b1', b1)
-                        elif not captured['bp1']:
-                            moveB('bp1', 'b1', b1)
-                
-            
-            
-            
-            # Computer is put in stalemate
-            if stale:
-                gs = 'win'
-                cause = '''AI is in stalemate'''
-            
-            
-            capture('b')
-            turn()
-            stalemate()
-        
-        
-        
-        # Player is put in stalemate
-        if pMove and stale and gs == 'play':
-            gs = 'lose'
-            cause = '''you are in stalemate'''
-        
-        
-        
-        
-        # Board is updated
-        
-        
-        write('1', (100,475), 100)
-        write('2', (100,325), 100)
-        write('3', (100,175), 100)
-        
-        write('A', (210,50),  100)
-        write('B', (360,50),  100)
-        write('C', (510,50),  100)
-        
-        write('Title', (522,635), 80)
-        screen.draw.rect(TitleBx, color=(0))
-        
-        setOcc()
         grid()
         pawn()
         
-                  
-        
-        
-        # Checking for victory or defeat
-    
-        if len(bOcc) == 0:
-            gs = 'win'
-            cause = 'all pawns captured'
-            
-        elif a3 in wOcc.values() or b3 in wOcc.values() or c3 in wOcc.values():
-            gs = 'win'
-            cause = 'you reached other side'
-        
-            
-        elif len(wOcc) == 0:
-            gs = 'lose'
-            cause = 'all pawns captured'
+        write('Title', (522,635), 80)
+        screen.draw.rect(TitleBx, color=(0))
         
-        elif a1 in bOcc.values() or b1 in bOcc.values() or c1 in bOcc.values():
-            gs = 'lose'
-            cause = 'AI reached other side'
-            
-    
+        looks = [look(sp) for sp in range(9)]
     
     
     # Win Screen
     
     
-    if gs == 'win':
-        
-        clear()
+    elif gs == 'win':
         
         write('YOU WIN',          (220,100), 150)
         write('Update Database?', (190,350), 80)
@@ -1467,9 +888,7 @@ def draw():
     # Lose Screen
     
     
-    if gs == 'lose':
-        
-        clear()
+    elif gs == 'lose':
         
         write('YOU LOSE',         (210,100), 150)
         write('Update Database?', (190,350), 80)
@@ -1479,10 +898,34 @@ def draw():
         
         screen.draw.rect(YesBx, color=(0))
         screen.draw.rect(NoBx, color=(0))
+
+
+
+def timings():
+    '''Draws the frame timers over the bottom left corner of the screen'''
     
+    rows = profile.rows() + [[profile.spread()]]
+    top  = HEIGHT - 18 * len(rows) - 10
     
-    setOcc()
-        
+    screen.draw.filled_rect(Rect((0, top), (300, HEIGHT - top)), (255,255,255))
+    
+    for n, row in enumerate(rows):
+        for x, wd in zip((5, 75, 140, 205), row):
+            screen.blit(ptext.getsurf(wd, fontname = None, fontsize = 18, color = ink), (x, top + 5 + 18 * n))
+
+
+
+def draw():
+    '''Function that runs continuously while the game is being played'''
+    
+    with profile('draw'):
+        paint()
+    
+    if overlay:
+        timings()
+    
+    profile.frame()
+
 
 
 
@@ -1491,185 +934,118 @@ def draw():
 
 
 
-def on_mouse_up(pos, button):
-    '''Function that runs when the mouse button is released'''
+def toggleLearning():
+    '''Switches the learning rate between fast and slow'''
     
-    global gs
-    global butn
-    global mPos
-    global pMove
-    global cMove
-    global mvdPos
-    global mvdSp
-    global misclick
-    global cause
     global learning
+    
+    if learning == 'fast':
+        learning = 'slow'
+    else:
+        learning = 'fast'
+    
+    
+    
+def toggleSound():
+    '''Turns sound on or off'''
+    
     global snd
     
-    global occupy
-    global valid
-    global selected
+    snd = not snd
     
-    global wp1Pos
-    global wp2Pos
-    global wp3Pos
     
-    global bp1Pos
-    global bp2Pos
-    global bp3Pos
     
+def confirmReset():
+    '''Wipes the AI's database and goes back to the options screen'''
     
-    butn = button
-    mPos = pos
+    forget()
+    go('options')
     
     
-
     
-    # Player move
-    if pMove:
+def toggleOverlay():
+    '''Shows or hides the frame timers'''
     
+    global overlay
+    global shown
     
+    overlay = not overlay
+    shown   = None                      # The whole screen is drawn again, so a hidden overlay is cleared
     
     
-        # Pawn 1 is selected
-        if click('play', occupy['wp1']) and captured['wp1'] == False and True not in selected.values():
-                        
-            selected['wp1'] = True
-            validate('wp1')
-        
-        
-        # Pawn 1 movement is cancelled
-        elif click('play', occupy['wp1']) and not captured['wp1']:
-            reset()
+    
+def updateDatabase(rate):
+    '''Updates the AI database after a game if the learning rate calls for it, then goes back to the title screen
+    
+       Parameters:
+       rate = learning rate that learns from this result (fast learns from wins, slow from losses)
+    '''
+    
+    if learning == rate:
+        learn()
+    
+    go('title')
 
 
-        # Pawn 1 is moved
-        elif selected['wp1']:
-            moveW()
-            
-            if True not in selected.values() and not misclick:
-                
-                occupy['wp1'] = mvdSp
-                wp1Pos = mvdPos
-                capture('w')
-                turn()
-        
-        
-        
-        # Pawn 2 is selected
-        elif click('play', occupy['wp2']) and captured['wp2'] == False and True not in selected.values():
-            
-            selected['wp2'] = True
-            validate('wp2')
-                
-        
-        # Pawn 2 movement is cancelled
-        elif click('play', occupy['wp2']) and not captured['wp2']:
-            reset()
-        
-        
-        # Pawn 2 is moved
-        elif selected['wp2']:
-            moveW()
-            
-            if True not in selected.values() and not misclick:
-                
-                occupy['wp2'] = mvdSp
-                wp2Pos = mvdPos
-                capture('w')
-                turn()
-            
-            
-            
-        # Pawn 3 is selected
-        elif click('play', occupy['wp3']) and captured['wp3'] == False and True not in selected.values():
-            
-            selected['wp3'] = True
-            validate('wp3')
 
+# Buttons
 
-        # Pawn 3 movement is cancelled
-        elif click('play', occupy['wp3']) and not captured['wp3']:
-            reset()
 
-        
-        # Pawn 3 is moved
-        elif selected['wp3']:
-            moveW()
-            
-            if True not in selected.values() and not misclick:
-                
-                occupy['wp3'] = mvdSp
-                wp3Pos = mvdPos
-                capture('w')
-                turn()
-        
-        
-        
-        
-    # Buttons
+register('title',   StartBx,   lambda: go('play'))
+register('title',   HelpBx,    lambda: go('help'))
+register('title',   OptionsBx, lambda: go('options'))
 
-    
+register('options', LearnBx,   toggleLearning)
+register('options', SoundBx,   toggleSound)
+register('options', ResetBx,   lambda: go('confirm'))
 
+register('confirm', YesBx,     confirmReset)
+register('confirm', NoBx,      lambda: go('options'))
 
-    # Start the game
-    if click('title', StartBx):
-        gs = 'play'
-    
-    # Go to help screen
-    elif click('title', HelpBx):
-        gs = 'help'
+register('help',    TitleBx,   lambda: go('title'))
+register('options', TitleBx,   lambda: go('title'))
+register('play',    TitleBx,   lambda: go('title'))
+
+register('win',     YesBx,     lambda: updateDatabase('fast'))
+register('lose',    YesBx,     lambda: updateDatabase('slow'))
+register('win',     NoBx,      lambda: go('title'))
+register('lose',    NoBx,      lambda: go('title'))
+
+
+
+def on_mouse_up(pos, button):
+    '''Function that runs when the mouse button is released'''
     
-    # Go to options screen
-    elif click('title', OptionsBx):
-        gs = 'options'
+    profile.begin()
     
+    left = button == mouse.LEFT
     
     
-    # Learning rate
-    elif click('options', LearnBx):
-        if learning == 'fast':
-            learning = 'slow'
-        else:
-            learning = 'fast'
+    # Player move, any click that isn't a move cancels the pawn that is selected
+    if gs == 'play' and pMove:
         
-    # Toggle Sound
-    elif click('options', SoundBx):
-        snd = not snd
-
-    # Reset AI database confirmation screen
-    elif click('options', ResetBx):
-        gs = 'confirm'
-    
-    # Confirm AI reset
-    elif click('confirm', YesBx):
-        forget()
-        gs = 'options'
-    
-    # Cancel AI reset
-    elif click('confirm', NoBx):
-        gs = 'options'
+        with profile('player'):
+            moved = moveW(cell(pos) if left else None)
         
+        if moved:
+            computer()
+            return
     
     
-    # Go to title screen
-    elif click('help', TitleBx) or click('options', TitleBx) or click('play', TitleBx):
-        gs = 'title'
-        
-        
+    # Buttons
+    if left:
+        action = hit(pos)
         
-    # Win: update database
-    elif click('win', YesBx):
-        if learning == 'fast':
-            learn()
-        gs = 'title'
-    
-    # Lose: update database
-    elif click('lose', YesBx):
-        if learning == 'slow':
-            learn()
-        gs = 'title'
-    
-    # Don't update database
-    elif click('win', NoBx) or click('lose', NoBx):
-        gs = 'title'
\ No newline at end of file
+        if action:
+            action()
+
+
+
+def on_key_down(key):
+    '''Function that runs when a key is pressed'''
+    
+    profile.begin()
+    
+    # F3 shows or hides the frame timers, if the game was started with them on
+    if key == keys.F3 and profile.on:
+        toggleOverlay()
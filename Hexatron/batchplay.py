@@ -0,0 +1,304 @@
+#-----------------------------------------------------------------------------
+# Name:        Batched Self-Play (batchplay.py)
+# Purpose:     Trains the AI database on thousands of games at once with NumPy
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Plays the same games as selfplay.py (the matchbox AI as black against a
+# computer-controlled white player), but many of them side by side as NumPy
+# arrays instead of one at a time in Python.
+#
+# Every position a game against the AI can reach is numbered once, and
+# tables are made of where each one leads: white's legal moves, the
+# position after the AI draws each bead colour, and whether the game is
+# over. A batch of games is then just an array of position numbers, moved
+# on a turn at a time with a few array lookups. Beads are drawn for every
+# game in the batch at once from the running totals of their matchboxes.
+#
+# Every game in a batch is played with the same bead counts, and the
+# updates of all of them are added up with np.add.at and applied together
+# at the end of the batch. They are limited the same way as learn() does
+# (fast learning never empties a matchbox, slow learning stops at the
+# database's cap). A batch size of 1 learns exactly like selfplay.py.
+#
+# NumPy is only needed for this file, the game and selfplay.py run without it.
+#
+# Usage:
+#   python batchplay.py [-n GAMES] [--batch GAMES] [--learning fast|slow]
+#                       [--white random|first] [--db AI.txt] [--seed N]
+#
+#-----------------------------------------------------------------------------
+
+
+import argparse
+import sys
+import time as t
+
+from board import Position
+from matchbox import COLOURS, MatchboxStore
+from states import lookup
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+
+def tables():
+    '''Numbers every position a game against the AI can reach, and works out where each one leads
+
+       Position 0 is the start of the game. White's moves and the AI's moves
+       follow the same rules as selfplay.playGame().
+
+       Returns:
+       Dictionary of NumPy arrays, one entry per position:
+       end     = 0 if the game goes on, 1 if white has won, 2 if black has won
+       line    = AI database line of the position, -1 if the AI isn't to move
+       replies = numbers of the positions after each of white's moves, padded with -1
+       options = number of moves white has
+       beads   = numbers of the positions after the AI draws each colour
+    '''
+
+    ids   = {Position() : 0}
+    found = [Position()]
+    links = []
+
+    for pos in found:
+        end   = pos.outcome()
+        state = None
+        after = []
+
+        if end:
+            winner = end[0]
+
+        elif pos.turn == 'w':
+            winner = None
+            after  = [pos.play(frm, to) for frm, to in pos.moves()]
+
+        else:
+            state  = lookup(pos)
+            winner = None if state else 'w'
+
+            if state:
+                for c in COLOURS:
+                    if c in state[1]:
+                        after.append(pos.play(*state[1][c]))
+                    else:
+                        after.append(Position(pos.white, pos.black, 'w'))
+
+        for nxt in after:
+            if nxt not in ids:
+                ids[nxt] = len(found)
+                found.append(nxt)
+
+        links.append((winner, state[0] if state else -1, [ids[nxt] for nxt in after]))
+
+    size  = len(found)
+    most  = max(len(after) for winner, line, after in links if line < 0)
+    out   = {'end'     : np.zeros(size, np.int8),
+             'line'    : np.full(size, -1, np.int32),
+             'replies' : np.full((size, most), -1, np.int32),
+             'options' : np.zeros(size, np.int32),
+             'beads'   : np.full((size, len(COLOURS)), -1, np.int32)}
+
+    for n, (winner, line, after) in enumerate(links):
+        out['end'][n]  = {None : 0, 'w' : 1, 'b' : 2}[winner]
+        out['line'][n] = line
+
+        if line >= 0:
+            out['beads'][n] = after
+        elif after:
+            out['replies'][n, :len(after)] = after
+            out['options'][n] = len(after)
+
+    return out
+
+
+
+def playBatch(counts, games, white, rng, graph):
+    '''Plays a batch of games side by side, all with the same bead counts
+
+       Parameters:
+       counts = NumPy array of bead counts, one row per AI database line
+       games  = number of games in the batch
+       white  = 'random' or 'first', how the player picks its moves
+       rng    = NumPy random number generator
+       graph  = tables() of the positions
+
+       Returns:
+       (winner, line, colour) arrays, where winner is 1 for white and 2 for
+       black, and line and colour are each game's last AI decision (-1 if none)
+    '''
+
+    end     = graph['end']
+    pos     = np.zeros(games, np.int32)
+    winner  = np.zeros(games, np.int8)
+    line    = np.full(games, -1, np.int32)
+    colour  = np.full(games, -1, np.int32)
+    playing = np.arange(games)
+    totals  = np.cumsum(counts, axis=1)
+
+    while playing.size:
+
+        # Player's move
+        here = pos[playing]
+
+        if white == 'random':
+            pick = (rng.random(playing.size) * graph['options'][here]).astype(np.int32)
+        else:
+            pick = np.zeros(playing.size, np.int32)
+
+        pos[playing] = graph['replies'][here, pick]
+        over = end[pos[playing]]
+        winner[playing] = over
+        playing = playing[over == 0]
+
+        if not playing.size:
+            break
+
+        # Computer's move, a bead is drawn from each game's matchbox
+        here  = pos[playing]
+        box   = graph['line'][here]
+        total = totals[box]
+        drawn = rng.random(playing.size) * total[:, -1]
+        bead  = (drawn[:, None] >= total).sum(axis=1)
+
+        line[playing]   = box
+        colour[playing] = bead
+        pos[playing]    = graph['beads'][here, bead]
+
+        over = end[pos[playing]]
+        winner[playing] = over
+        playing = playing[over == 0]
+
+    return winner, line, colour
+
+
+
+def learnBatch(counts, winner, line, colour, learning, cap=9):
+    '''Applies the updates of a whole batch of games to the bead counts
+
+       Parameters:
+       counts   = NumPy array of bead counts, one row per AI database line
+       winner   = array of each game's winner (1 white, 2 black)
+       line     = array of each game's last AI database line (-1 if none)
+       colour   = array of the colour drawn there
+       learning = 'fast' (a bead is removed when the AI loses) or 'slow' (added when it wins)
+       cap      = most beads slow learning can fill a matchbox with (None for no limit)
+
+       Returns:
+       (new bead counts, number of games that asked for an update)
+    '''
+
+    chosen = (line >= 0) & (winner == (1 if learning == 'fast' else 2))
+    change = np.zeros_like(counts)
+
+    np.add.at(change, (line[chosen], colour[chosen]), 1)
+
+    if learning == 'fast':
+        new   = np.maximum(counts - change, 0)
+        empty = new.sum(axis=1) == 0
+
+        # A matchbox is never emptied, it keeps one bead of the colour it had the most of
+        new[empty, counts[empty].argmax(axis=1)] = 1
+
+    else:
+        new = counts + change
+
+        if cap is not None:
+            # Matchboxes that would go over the cap only get the beads there is room for,
+            # going to the colours that won the most games first
+            for row in np.flatnonzero(new.sum(axis=1) > cap):
+                room     = max(cap - int(counts[row].sum()), 0)
+                new[row] = counts[row]
+
+                for c in np.argsort(-change[row], kind='stable'):
+                    add          = min(int(change[row, c]), room)
+                    new[row, c] += add
+                    room        -= add
+
+    return new, int(np.count_nonzero(chosen))
+
+
+
+def train(store, games, batch=4096, white='random', learning='fast', seed=None):
+    '''Plays many games in batches, updating the AI database after each batch
+
+       The database is only changed in memory, call store.flush() to save it.
+
+       Parameters:
+       store    = MatchboxStore to train
+       games    = number of games to play
+       batch    = number of games played side by side
+       white    = 'random' or 'first', how the player picks its moves
+       learning = 'fast' or 'slow', as on the options screen
+       seed     = seed for reproducible runs
+
+       Returns:
+       Dictionary of the number of games won by each side, the time taken and games/sec
+    '''
+
+    if np is None:
+        raise ImportError('batchplay needs NumPy, use selfplay.py instead')
+
+    rng    = np.random.default_rng(seed)
+    graph  = tables()
+    counts = np.array(store.counts, dtype=np.int64)
+    wins   = {'w' : 0, 'b' : 0}
+    start  = t.perf_counter()
+    done   = 0
+    moved  = 0
+
+    while done < games:
+        size = min(batch, games - done)
+        winner, line, colour = playBatch(counts, size, white, rng, graph)
+
+        wins['w'] += int(np.count_nonzero(winner == 1))
+        wins['b'] += int(np.count_nonzero(winner == 2))
+
+        counts, updates = learnBatch(counts, winner, line, colour, learning, store.cap)
+        moved += updates
+        done  += size
+
+    seconds = t.perf_counter() - start
+    store.assign(counts.tolist(), moved)
+
+    return {'games'   : games,
+            'player'  : wins['w'],
+            'ai'      : wins['b'],
+            'seconds' : seconds,
+            'rate'    : games / seconds if seconds else float('inf')}
+
+
+
+def main():
+    '''Trains the AI database in batches from the command line'''
+
+    parser = argparse.ArgumentParser(description='Train the Hexatron AI on many games at once with NumPy')
+    parser.add_argument('-n', '--games',  type=int, default=100000,        help='number of games to play')
+    parser.add_argument('--batch',        type=int, default=4096,          help='games played side by side')
+    parser.add_argument('--learning',     choices=('fast', 'slow'),        default='fast')
+    parser.add_argument('--white',        choices=('first', 'random'),     default='random',
+                        help='player the AI is trained against')
+    parser.add_argument('--db',           default='AI.txt',                help='AI database to train')
+    parser.add_argument('--seed',         type=int,                        help='seed for reproducible runs')
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit('batchplay.py needs NumPy (pip install numpy), selfplay.py trains without it')
+
+    store = MatchboxStore(args.db)
+    stats = train(store, args.games, args.batch, args.white, args.learning, args.seed)
+    store.flush()
+
+    print('%d games in %.3fs (%.0f games/sec)' % (stats['games'], stats['seconds'], stats['rate']))
+    print('Player won %d, AI won %d (%.1f%%)' % (stats['player'], stats['ai'], 100 * stats['ai'] / stats['games']))
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,408 @@
+#-----------------------------------------------------------------------------
+# Name:        Benchmarks (bench.py)
+# Purpose:     Times move generation, AI choices, learning and drawing the game
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Each benchmark is run once to warm up, then timed over several rounds.
+# Every round does the same work, picked with the same seed, so two runs
+# of the same code only differ by how fast the computer was. The results
+# are given in operations per second:
+#
+#   median - the middle round
+#   p95    - 95% of the rounds were at least this fast
+#   stdev  - how much the rounds differed
+#
+#   movegen   - positions reached by every legal move, from every position
+#               a game can reach
+#   decisions - AI states looked up and beads drawn from them
+#   learns    - AI database updates, each one written to a file as the game
+#               does after "Update Database?"
+#   draw      - frames of the game screen drawn from scratch
+#   idle      - frames where nothing changed, as most frames of a game are
+#
+# The two drawing benchmarks load Hexatron v3.py with Pygame Zero and a
+# dummy display, and are skipped if Pygame Zero isn't installed. Everything
+# is run in a temporary folder holding copies of the default AI database,
+# so nothing here changes AI.txt or the game journal.
+#
+# --save writes the results to a JSON baseline file, and --compare checks
+# them against one, ending with an error code if any benchmark got slower
+# by more than the tolerance.
+#
+# Usage:
+#   python bench.py [--only NAME ...] [--repeats N] [--seed N]
+#                   [--save [FILE]] [--compare [FILE]] [--tolerance PERCENT]
+#
+#-----------------------------------------------------------------------------
+
+
+import argparse
+import json
+import os
+import platform
+import random as rn
+import shutil
+import statistics as st
+import sys
+import tempfile
+import time as t
+
+from types import ModuleType
+
+from matchbox import MatchboxStore
+from solver import reachable
+from states import lookup
+
+
+HERE     = os.path.dirname(os.path.abspath(__file__))
+GAME     = os.path.join(HERE, 'Hexatron v3.py')
+DEFAULT  = os.path.join(HERE, 'AI Default.txt')
+BASELINE = 'Benchmarks.json'            # Baseline file used by --save and --compare
+VERSION  = 1                            # Baseline file format version
+
+game = None                             # Hexatron v3.py, loaded once by the drawing benchmarks
+
+
+
+def percentile(values, p):
+    '''Finds the value a given percentage of the values are at or below (nearest rank)
+
+       Parameters:
+       values = list of numbers
+       p      = percentage, from 0 to 100
+
+       Returns:
+       The value
+    '''
+
+    ordered = sorted(values)
+    rank    = max(1, -(-len(ordered) * p // 100))
+
+    return ordered[int(rank) - 1]
+
+
+
+def measure(work, repeats):
+    '''Times a benchmark over several rounds, after one round to warm up
+
+       Parameters:
+       work    = function doing one round, returning the number of operations done
+       repeats = number of rounds timed
+
+       Returns:
+       Dictionary of the median, p95 and stdev of the operations/sec, and each round's rate
+    '''
+
+    work()
+    rates = []
+
+    for n in range(repeats):
+        start = t.perf_counter()
+        done  = work()
+        rates.append(done / (t.perf_counter() - start))
+
+    return {'median' : st.median(rates),
+            'p95'    : percentile(rates, 5),
+            'stdev'  : st.stdev(rates) if len(rates) > 1 else 0.0,
+            'rounds' : rates}
+
+
+
+def movegen(rng):
+    '''Plays every legal move from every position a game can reach'''
+
+    positions = [pos for pos in reachable()[0] if not pos.outcome()]
+    rng.shuffle(positions)
+
+    def work():
+        done = 0
+
+        for n in range(20):
+            for pos in positions:
+                for frm, to in pos.moves():
+                    pos.play(frm, to)
+                    done += 1
+
+        return done
+
+    return work
+
+
+
+def decisions(rng):
+    '''Looks up the AI state of boards the computer moves on, and draws a bead from it'''
+
+    store     = MatchboxStore(rng=rng)
+    positions = [pos for pos in reachable()[0] if pos.turn == 'b' and not pos.outcome() and lookup(pos)]
+    picks     = [rng.choice(positions) for n in range(5000)]
+
+    def work():
+
+        for pos in picks:
+            store.choose(lookup(pos)[0])
+
+        return len(picks)
+
+    return work
+
+
+
+def learns(rng):
+    '''Updates the AI database and writes it to its file after every update, as learn() in the game does'''
+
+    store = MatchboxStore(rng=rng)
+    picks = [rng.randrange(len(store.counts)) for n in range(100)]
+
+    def work():
+
+        # A bead is taken away then put back, so the database doesn't drift between rounds
+        for indx in picks:
+            colour = store.choose(indx)
+
+            for learning in ('fast', 'slow'):
+                store.learn(indx, colour, learning)
+                store.flush()
+
+        return 2 * len(picks)
+
+    return work
+
+
+
+def load():
+    '''Loads the game with Pygame Zero, drawing to a dummy display
+
+       The game keeps its AI database and journal in the current folder.
+
+       Returns:
+       The game's module, or None if Pygame Zero isn't installed
+    '''
+
+    global game
+
+    if game is not None:
+        return game
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    try:
+        from pgzero.game import PGZeroGame
+        from pgzero.runner import prepare_mod
+    except ImportError:
+        return None
+
+    mod = ModuleType('game')
+    mod.__file__ = GAME
+    prepare_mod(mod)
+
+    with open(GAME) as f:
+        exec(compile(f.read(), GAME, 'exec'), mod.__dict__)
+
+    PGZeroGame(mod).reinit_screen()
+    game = mod
+
+    return game
+
+
+
+def draw(rng):
+    '''Draws the game screen from scratch, after a few random moves have been played'''
+
+    mod = load()
+
+    if mod is None:
+        return None
+
+    mod.snd    = False
+    mod.ai.rng = rng
+    mod.go('title')
+    mod.go('play')
+
+    # The player moves at random for a few turns, so the board isn't the starting one
+    for n in range(2):
+        frm, to = rng.choice(mod.brd.moves())
+        mod.on_mouse_up(mod.spaces[frm], mod.mouse.LEFT)
+        mod.on_mouse_up(mod.spaces[to], mod.mouse.LEFT)
+
+        if mod.gs != 'play':
+            mod.go('title')
+            mod.go('play')
+
+    def work():
+
+        for n in range(100):
+            mod.shown = None
+            mod.draw()
+            mod.pygame.display.flip()
+
+        return 100
+
+    return work
+
+
+
+def idle(rng):
+    '''Draws frames of the game screen where nothing changed'''
+
+    mod = load()
+
+    if mod is None:
+        return None
+
+    mod.go('title')
+    mod.go('play')
+    mod.draw()
+
+    def work():
+
+        for n in range(1000):
+            mod.draw()
+            mod.pygame.display.flip()
+
+        return 1000
+
+    return work
+
+
+
+# Benchmarks that can be chosen, in the order they are run, with what they count
+BENCHMARKS = {'movegen'   : (movegen,   'positions/sec'),
+              'decisions' : (decisions, 'decisions/sec'),
+              'learns'    : (learns,    'learns/sec'),
+              'draw'      : (draw,      'frames/sec'),
+              'idle'      : (idle,      'frames/sec')}
+
+
+
+def report(name, result):
+    '''Prints one benchmark's results'''
+
+    print('%-10s %12.0f %12.0f %10.0f   %s' % (name, result['median'], result['p95'], result['stdev'], result['unit']))
+
+
+
+def run(names, repeats, seed):
+    '''Runs benchmarks, each with its own random number generator seeded the same way
+
+       Parameters:
+       names   = benchmarks to run
+       repeats = number of rounds timed for each one
+       seed    = seed of every benchmark's random number generator
+
+       Returns:
+       Dictionary of each benchmark's results (benchmarks that were skipped are left out)
+    '''
+
+    folder  = tempfile.mkdtemp(prefix='hexatron-bench-')
+    here    = os.getcwd()
+    results = {}
+
+    shutil.copy(DEFAULT, os.path.join(folder, 'AI.txt'))
+    shutil.copy(DEFAULT, os.path.join(folder, 'AI Default.txt'))
+    os.chdir(folder)
+
+    try:
+        for name in names:
+            setup, unit = BENCHMARKS[name]
+            work        = setup(rn.Random(seed))
+
+            if work is None:
+                print('%-10s skipped, Pygame Zero is not installed' % name)
+                continue
+
+            results[name] = dict(measure(work, repeats), unit=unit)
+            report(name, results[name])
+
+    finally:
+        if game is not None:
+            game.journal.close()
+
+        os.chdir(here)
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return results
+
+
+
+def compare(results, baseline, tolerance):
+    '''Checks results against a baseline
+
+       Parameters:
+       results   = dictionary of each benchmark's results
+       baseline  = contents of a baseline file
+       tolerance = percentage a median can drop by before it counts as slower
+
+       Returns:
+       List of the benchmarks that got slower
+    '''
+
+    slower = []
+
+    print()
+    print('%-10s %12s %12s %8s' % ('', 'baseline', 'now', 'change'))
+
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+
+        if old is None:
+            continue
+
+        change = 100 * (result['median'] / old['median'] - 1)
+        note   = ''
+
+        if change < -tolerance:
+            note = '  slower'
+            slower.append(name)
+
+        print('%-10s %12.0f %12.0f %+7.1f%%%s' % (name, old['median'], result['median'], change, note))
+
+    return slower
+
+
+
+def main():
+    '''Runs the benchmarks from the command line'''
+
+    parser = argparse.ArgumentParser(description='Time the Hexatron move generator, AI and drawing')
+    parser.add_argument('--only',      nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        metavar='NAME',                                  help='benchmarks to run')
+    parser.add_argument('--repeats',   type=int, default=15,             help='rounds timed for each benchmark')
+    parser.add_argument('--seed',      type=int, default=1,              help='seed of the work each round does')
+    parser.add_argument('--save',      nargs='?', const=BASELINE,        help='write the results to a baseline file')
+    parser.add_argument('--compare',   nargs='?', const=BASELINE,        help='check the results against a baseline file')
+    parser.add_argument('--tolerance', type=float, default=10.0,         help='percent slower allowed by --compare')
+    args = parser.parse_args()
+
+    # Baseline files are found from where the command was run, not the temporary folder
+    save    = args.save and os.path.abspath(args.save)
+    against = args.compare and os.path.abspath(args.compare)
+
+    print('%-10s %12s %12s %10s' % ('', 'median', 'p95', 'stdev'))
+
+    results = run(args.only, args.repeats, args.seed)
+
+    if save:
+        with open(save, 'w') as f:
+            json.dump({'version' : VERSION,
+                       'seed'    : args.seed,
+                       'repeats' : args.repeats,
+                       'python'  : platform.python_version(),
+                       'machine' : platform.machine(),
+                       'results' : results}, f, indent=2)
+
+    if against:
+        with open(against) as f:
+            baseline = json.load(f)
+
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,535 @@
+#-----------------------------------------------------------------------------
+# Name:        Hexapawn Board (board.py)
+# Purpose:     Bitboard position of a game of Hexapawn (3x3 or any other size)
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Spaces are numbered 0-8 from a1 to c3, rank by rank:
+#
+#   a3 b3 c3        6 7 8
+#   a2 b2 c2        3 4 5
+#   a1 b1 c1        0 1 2
+#
+# A position is two 9-bit masks (bit n set = a pawn on space n) for the
+# white (player) and black (computer) pawns, plus the side to move. White
+# moves up the board (+3), black moves down it (-3).
+#
+# Other board sizes are numbered the same way, rank by rank from a1, so on
+# a board W spaces wide white moves +W and black moves -W. A Board holds
+# the masks of one size, and every Position keeps the Board it is on (the
+# 3x3 board unless it is given another one). Boards are made with shape(),
+# which hands back the same Board every time for the same size.
+#
+# Each Board also has tables, made once, of the space in front of a pawn
+# on every space and the spaces it can capture on, for each side. A single
+# pawn's moves (reach()) are then two table reads masked with the board.
+# moves() and stuck() still shift whole masks, doing every pawn at once.
+#
+# Positions remember whether the game is over once it has been worked out.
+# play() works it out straight away for a game that was still going, from
+# the move alone: only the pawn that moved can have reached the other side
+# or taken the last enemy pawn, so the only board-wide check left is
+# whether the other side is stuck. outcome() is then just a lookup.
+#
+# Every position also carries two Zobrist hashes: the XOR of a random
+# 64-bit number for each pawn (one set of numbers per side and space) and
+# one more when black is to move. code hashes the board as it is and
+# mirrored hashes it flipped left to right, so a board and its mirror image
+# can be told apart or matched without building either one. Both are
+# updated by play() with a few XORs for the pawn that moved and any pawn it
+# captured. The numbers come from a generator seeded with the board size,
+# so they are the same every run.
+#
+#-----------------------------------------------------------------------------
+
+
+import random as rn
+
+
+SQUARES = ('a1', 'b1', 'c1',
+           'a2', 'b2', 'c2',
+           'a3', 'b3', 'c3')
+
+FULL   = 0b111111111                    # Every space on the board
+RANK1  = 0b000000111                    # White's starting rank, black's goal
+RANK2  = 0b000111000                    # Middle rank of the board
+RANK3  = 0b111000000                    # Black's starting rank, white's goal
+FILE_A = 0b001001001                    # Left edge of the board
+FILE_B = 0b010010010                    # Middle file of the board
+FILE_C = 0b100100100                    # Right edge of the board
+
+
+
+def bits(mask):
+    '''Lists the spaces set in a mask
+
+       Parameters:
+       mask = 9-bit mask of spaces
+
+       Returns:
+       List of space numbers, lowest first
+    '''
+
+    out = []
+
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+
+    return out
+
+
+
+def count(mask):
+    '''Returns the number of spaces set in a mask'''
+
+    return bin(mask).count('1')
+
+
+
+def flip(mask):
+    '''Mirrors a mask left to right (a <-> c)'''
+
+    return ((mask & FILE_A) << 2) | (mask & FILE_B) | ((mask & FILE_C) >> 2)
+
+
+
+def turnover(mask):
+    '''Mirrors a mask top to bottom (rank 1 <-> rank 3)'''
+
+    return ((mask & RANK1) << 6) | (mask & RANK2) | ((mask & RANK3) >> 6)
+
+
+
+def across(sp):
+    '''Returns the space mirrored top to bottom (rank 1 <-> rank 3)'''
+
+    return sp + 6 - 6 * (sp // 3)
+
+
+
+class Board:
+    '''Size of a Hexapawn board, and the masks its positions are checked with
+
+       Parameters:
+
+       width  = number of files (a, b, c, ...), also the number of pawns on each side
+       height = number of ranks (1, 2, 3, ...)
+    '''
+
+    def __init__(self, width=3, height=3):
+
+        self.width   = width
+        self.height  = height
+        self.size    = width * height
+        self.full    = (1 << self.size) - 1
+        self.first   = (1 << width) - 1                          # White's starting rank, black's goal
+        self.last    = self.first << (width * (height - 1))      # Black's starting rank, white's goal
+        self.left    = sum(1 << (width * r) for r in range(height))
+        self.right   = self.left << (width - 1)
+        self.files   = tuple(self.left << f for f in range(width))
+        self.ranks   = tuple(self.first << (width * r) for r in range(height))
+        self.squares = tuple('abcdefghijklmnopqrstuvwxyz'[f] + str(r + 1)
+                             for r in range(height) for f in range(width))
+
+        # Space a pawn on each space moves forward to, and spaces it can capture on, by side to move
+        self.steps = {'w' : tuple(self.step(sp, 1) for sp in range(self.size)),
+                      'b' : tuple(self.step(sp, -1) for sp in range(self.size))}
+        self.takes = {'w' : tuple(self.take(sp, 1) for sp in range(self.size)),
+                      'b' : tuple(self.take(sp, -1) for sp in range(self.size))}
+
+        # Zobrist numbers of a white or black pawn on each space, and of black being to move
+        rng         = rn.Random('zobrist %dx%d' % (width, height))
+        self.zWhite = tuple(rng.getrandbits(64) for sp in range(self.size))
+        self.zBlack = tuple(rng.getrandbits(64) for sp in range(self.size))
+        self.zTurn  = rng.getrandbits(64)
+
+        # The same numbers for the board mirrored left to right
+        self.zWhiteFlip = tuple(self.zWhite[self.beside(sp)] for sp in range(self.size))
+        self.zBlackFlip = tuple(self.zBlack[self.beside(sp)] for sp in range(self.size))
+
+
+    def __repr__(self):
+
+        return 'shape(%d, %d)' % (self.width, self.height)
+
+
+    def flip(self, mask):
+        '''Mirrors a mask left to right (the a file <-> the last file)'''
+
+        out = 0
+
+        for f in range(self.width):
+            out |= ((mask & self.files[f]) >> f) << (self.width - 1 - f)
+
+        return out
+
+
+    def turnover(self, mask):
+        '''Mirrors a mask top to bottom (rank 1 <-> the last rank)'''
+
+        out  = 0
+        step = self.width
+
+        for r in range(self.height):
+            out |= ((mask & self.ranks[r]) >> (step * r)) << (step * (self.height - 1 - r))
+
+        return out
+
+
+    def step(self, sp, way):
+        '''Finds the space in front of a pawn
+
+           Parameters:
+           sp  = space the pawn is on
+           way = 1 for a white pawn (up the board), -1 for a black pawn
+
+           Returns:
+           Mask of the space, 0 if the pawn is on the last rank it can reach
+        '''
+
+        rank = sp // self.width + way
+
+        if not 0 <= rank < self.height:
+            return 0
+
+        return 1 << (sp + way * self.width)
+
+
+    def take(self, sp, way):
+        '''Finds the spaces diagonally in front of a pawn, where it can capture
+
+           Parameters:
+           sp  = space the pawn is on
+           way = 1 for a white pawn (up the board), -1 for a black pawn
+
+           Returns:
+           Mask of the spaces
+        '''
+
+        ahead = self.step(sp, way)
+        file  = sp % self.width
+        out   = 0
+
+        if ahead and file > 0:
+            out |= ahead >> 1
+
+        if ahead and file < self.width - 1:
+            out |= ahead << 1
+
+        return out
+
+
+    def hash(self, white, black, turn):
+        '''Works out the Zobrist hashes of a position from scratch
+
+           Parameters:
+           white = mask of the spaces occupied by white pawns
+           black = mask of the spaces occupied by black pawns
+           turn  = side to move, 'w' or 'b'
+
+           Returns:
+           (hash of the board, hash of the board mirrored left to right)
+        '''
+
+        code     = self.zTurn if turn == 'b' else 0
+        mirrored = code
+
+        for sp in bits(white):
+            code     ^= self.zWhite[sp]
+            mirrored ^= self.zWhiteFlip[sp]
+
+        for sp in bits(black):
+            code     ^= self.zBlack[sp]
+            mirrored ^= self.zBlackFlip[sp]
+
+        return code, mirrored
+
+
+    def across(self, sp):
+        '''Returns the space mirrored top to bottom (rank 1 <-> the last rank)'''
+
+        return sp + self.width * (self.height - 1 - 2 * (sp // self.width))
+
+
+    def beside(self, sp):
+        '''Returns the space mirrored left to right (the a file <-> the last file)'''
+
+        return sp + self.width - 1 - 2 * (sp % self.width)
+
+
+
+# Dictionary containing the board of every size made so far, by (width, height)
+boards = {}
+
+
+
+def shape(width=3, height=3):
+    '''Finds the board of a given size, making it the first time it is asked for
+
+       Parameters:
+       width  = number of files
+       height = number of ranks
+
+       Returns:
+       The Board of that size (the same object for every call)
+    '''
+
+    if (width, height) not in boards:
+        boards[width, height] = Board(width, height)
+
+    return boards[width, height]
+
+
+
+STANDARD = shape(3, 3)                  # The 3x3 board the game is played on
+
+
+
+class Position:
+    '''A Hexapawn position
+
+       Parameters:
+
+       white = mask of the spaces occupied by white pawns (its first rank by default)
+       black = mask of the spaces occupied by black pawns (its last rank by default)
+       turn  = side to move, 'w' or 'b'
+       board = Board the position is on (the 3x3 board by default)
+       codes = (code, mirrored) Zobrist hashes if already known, worked out otherwise
+
+       The position should not be changed once made, make a new one instead
+       so its hashes stay right.
+    '''
+
+    __slots__ = ('white', 'black', 'turn', 'board', 'code', 'mirrored', 'end')
+
+    def __init__(self, white=None, black=None, turn='w', board=STANDARD, codes=None):
+
+        self.white = board.first if white is None else white
+        self.black = board.last if black is None else black
+        self.turn  = turn
+        self.board = board
+
+        self.code, self.mirrored = codes or board.hash(self.white, self.black, turn)
+        self.end = False                    # outcome() once it is known, False until then
+
+
+    def __eq__(self, other):
+
+        return (isinstance(other, Position) and self.white == other.white and self.black == other.black
+                and self.turn == other.turn and self.board is other.board)
+
+
+    def __hash__(self):
+
+        return self.code
+
+
+    def __repr__(self):
+
+        if self.board is STANDARD:
+            return 'Position(%s, %s, %r)' % (bin(self.white), bin(self.black), self.turn)
+
+        return 'Position(%s, %s, %r, %r)' % (bin(self.white), bin(self.black), self.turn, self.board)
+
+
+    def key(self):
+        '''Returns the (white, black) masks of the position'''
+
+        return (self.white, self.black)
+
+
+    def mirror(self):
+        '''Returns the position mirrored left to right'''
+
+        if self.board is STANDARD:
+            return Position(flip(self.white), flip(self.black), self.turn)
+
+        b = self.board
+
+        return Position(b.flip(self.white), b.flip(self.black), self.turn, b)
+
+
+    def swap(self):
+        '''Returns the position seen from the other side of the board
+
+           The board is turned top to bottom and the colours are swapped, so
+           white's moves become black's moves. Moves are mapped back with across().
+        '''
+
+        if self.board is STANDARD:
+            return Position(turnover(self.black), turnover(self.white), 'b' if self.turn == 'w' else 'w')
+
+        b = self.board
+
+        return Position(b.turnover(self.black), b.turnover(self.white), 'b' if self.turn == 'w' else 'w', b)
+
+
+    def targets(self):
+        '''Finds every space the side to move can reach
+
+           Returns:
+           (forward, left captures, right captures) masks of destination spaces,
+           where left and right are towards the a and c files
+        '''
+
+        b     = self.board
+        w     = b.width
+        empty = b.full & ~(self.white | self.black)
+
+        if self.turn == 'w':
+            return ((self.white << w) & empty,
+                    ((self.white & ~b.left) << (w - 1)) & self.black,
+                    ((self.white & ~b.right) << (w + 1)) & self.black)
+
+        return ((self.black >> w) & empty,
+                ((self.black & ~b.left) >> (w + 1)) & self.white,
+                ((self.black & ~b.right) >> (w - 1)) & self.white)
+
+
+    def reach(self, sp):
+        '''Finds the spaces a pawn of the side to move can move to, from the precomputed tables
+
+           Parameters:
+           sp = space the pawn is on
+
+           Returns:
+           Mask of the spaces (empty if the side to move has no pawn there)
+        '''
+
+        b = self.board
+
+        if self.turn == 'w':
+            own, enemy = self.white, self.black
+        else:
+            own, enemy = self.black, self.white
+
+        if not own & (1 << sp):
+            return 0
+
+        return (b.steps[self.turn][sp] & ~(own | enemy)) | (b.takes[self.turn][sp] & enemy)
+
+
+    def moves(self):
+        '''Lists the legal moves of the side to move
+
+           Returns:
+           List of (from, to) space numbers
+        '''
+
+        ahead, left, right = self.targets()
+        step = self.board.width if self.turn == 'w' else -self.board.width
+        out  = []
+
+        for to in bits(ahead):
+            out.append((to - step, to))
+
+        for to in bits(left):
+            out.append((to - step + 1, to))
+
+        for to in bits(right):
+            out.append((to - step - 1, to))
+
+        return out
+
+
+    def stuck(self):
+        '''Checks if the side to move has no legal moves'''
+
+        ahead, left, right = self.targets()
+
+        return not (ahead | left | right)
+
+
+    def play(self, frm, to):
+        '''Makes a move, capturing any enemy pawn on the space moved to
+
+           Parameters:
+           frm = space the pawn is moved from
+           to  = space the pawn is moved to
+
+           Returns:
+           The new position, with the other side to move
+        '''
+
+        b    = self.board
+        move = (1 << frm) | (1 << to)
+
+        if self.turn == 'w':
+            code     = self.code ^ b.zTurn ^ b.zWhite[frm] ^ b.zWhite[to]
+            mirrored = self.mirrored ^ b.zTurn ^ b.zWhiteFlip[frm] ^ b.zWhiteFlip[to]
+
+            if self.black & (1 << to):
+                code     ^= b.zBlack[to]
+                mirrored ^= b.zBlackFlip[to]
+
+            after = Position(self.white ^ move, self.black & ~(1 << to), 'b', b, (code, mirrored))
+
+            # After a move from a game that was still going, only the pawn that moved can have ended it
+            if self.end is None:
+                if not after.black:
+                    after.end = ('w', 'captured')
+                elif (1 << to) & b.last:
+                    after.end = ('w', 'reached')
+                else:
+                    after.end = ('w', 'stalemate') if after.stuck() else None
+
+            return after
+
+        code     = self.code ^ b.zTurn ^ b.zBlack[frm] ^ b.zBlack[to]
+        mirrored = self.mirrored ^ b.zTurn ^ b.zBlackFlip[frm] ^ b.zBlackFlip[to]
+
+        if self.white & (1 << to):
+            code     ^= b.zWhite[to]
+            mirrored ^= b.zWhiteFlip[to]
+
+        after = Position(self.white & ~(1 << to), self.black ^ move, 'w', b, (code, mirrored))
+
+        if self.end is None:
+            if not after.white:
+                after.end = ('b', 'captured')
+            elif (1 << to) & b.first:
+                after.end = ('b', 'reached')
+            else:
+                after.end = ('b', 'stalemate') if after.stuck() else None
+
+        return after
+
+
+    def outcome(self):
+        '''Checks if the game is over
+
+           The whole board is only checked the first time, positions made by
+           play() from a game still going already know it.
+
+           Returns:
+           (winner, reason) where winner is 'w' or 'b' and reason is
+           'captured', 'reached' or 'stalemate', or None if the game goes on
+        '''
+
+        if self.end is not False:
+            return self.end
+
+        if not self.black:
+            self.end = ('w', 'captured')
+
+        elif self.white & self.board.last:
+            self.end = ('w', 'reached')
+
+        elif not self.white:
+            self.end = ('b', 'captured')
+
+        elif self.black & self.board.first:
+            self.end = ('b', 'reached')
+
+        elif self.stuck():
+            self.end = ('b' if self.turn == 'w' else 'w', 'stalemate')
+
+        else:
+            self.end = None
+
+        return self.end
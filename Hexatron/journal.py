@@ -0,0 +1,320 @@
+#-----------------------------------------------------------------------------
+# Name:        Game Journal (journal.py)
+# Purpose:     Compact append-only record of every game played, with an index
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Every finished game is added to the end of a binary journal: who won and
+# how, every move made, and every decision the AI made (its database line
+# and the colour it drew). Games are collected in memory and written out
+# together, once enough bytes or games have built up, when flush() is
+# called or when Python exits, so recording a game never waits on the disk.
+#
+# Journal file: the 4 bytes HXGJ, a format version byte and the board width
+# and height (1 byte each), then one record per game:
+#
+#   winner (0 white, 1 black), how the game ended (0 captured, 1 reached,
+#   2 stalemate), the number of moves and the number of AI decisions (1
+#   byte each), then every move as its from and to spaces (1 byte each,
+#   255 255 when a side had to pass), then every AI decision as its line
+#   (2 bytes) and colour (1 byte, its place in COLOURS).
+#
+# Index file (the journal's name with .idx added): where each game's record
+# starts in the journal (8 bytes each), so any game can be read without
+# reading the ones before it. The journal is always written before the
+# index. When a journal is opened, games missing from the index are added
+# back and a record cut short by a crash is removed.
+#
+# Everything is little-endian.
+#
+#-----------------------------------------------------------------------------
+
+
+import atexit
+import os
+import struct
+
+from board import STANDARD
+from matchbox import COLOURS
+
+
+MAGIC    = b'HXGJ'                      # First bytes of a journal
+VERSION  = 1                            # Journal format version
+HEADER   = struct.Struct('<4sBBB')      # Start of a journal
+RECORD   = struct.Struct('<BBBB')       # Start of a game's record
+DECISION = struct.Struct('<HB')         # One AI decision
+OFFSET   = struct.Struct('<Q')          # One index entry
+
+SIDES    = 'wb'                         # Winners, in the order they are numbered
+REASONS  = ('captured', 'reached', 'stalemate')
+PASS     = (255, 255)                   # Move written when a side has to pass
+
+
+
+def encode(winner, reason, moves, decisions):
+    '''Writes one game as a journal record
+
+       Parameters:
+       winner    = 'w' or 'b'
+       reason    = 'captured', 'reached' or 'stalemate'
+       moves     = list of (from, to) moves in the order they were played
+       decisions = list of the AI's (database line, colour) decisions
+
+       Returns:
+       Bytes of the record
+    '''
+
+    out = bytearray(RECORD.pack(SIDES.index(winner), REASONS.index(reason), len(moves), len(decisions)))
+
+    for frm, to in moves:
+        out += bytes((frm, to))
+
+    for line, colour in decisions:
+        out += DECISION.pack(line, COLOURS.index(colour))
+
+    return out
+
+
+
+def decode(data, offset):
+    '''Reads one game from a journal
+
+       Parameters:
+       data   = bytes holding the record
+       offset = where the record starts
+
+       Returns:
+       ((winner, reason, moves, decisions), where the next record starts),
+       or None if the record is cut short
+    '''
+
+    if offset + RECORD.size > len(data):
+        return None
+
+    winner, reason, size, chosen = RECORD.unpack_from(data, offset)
+    start = offset + RECORD.size
+    end   = start + 2 * size + DECISION.size * chosen
+
+    if end > len(data):
+        return None
+
+    moves     = [(data[start + 2 * n], data[start + 2 * n + 1]) for n in range(size)]
+    decisions = [(line, COLOURS[c]) for line, c in DECISION.iter_unpack(data[start + 2 * size:end])]
+
+    return (SIDES[winner], REASONS[reason], moves, decisions), end
+
+
+
+class Journal:
+    '''Append-only journal of finished games
+
+       Parameters:
+
+       path  = journal file (created if it doesn't exist)
+       size  = bytes to collect before they are written out
+       every = games to collect before they are written out
+       board = Board the games are played on
+    '''
+
+    def __init__(self, path="Games.hxj", size=65536, every=100, board=STANDARD):
+
+        self.path    = path
+        self.index   = path + '.idx'
+        self.size    = size
+        self.every   = every
+        self.board   = board
+        self.buffer  = bytearray()          # Records waiting to be written
+        self.pending = []                   # Where each waiting record will start
+        self.written = 0                    # Number of games in the files
+        self.end     = 0                    # Size of the journal file
+
+        self.recover()
+
+        self.data = open(self.path, 'ab')
+        self.idx  = open(self.index, 'ab')
+
+        atexit.register(self.close)
+
+
+    def __len__(self):
+
+        return self.written + len(self.pending)
+
+
+    def recover(self):
+        '''Creates the journal, or checks it and brings its index up to date'''
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, self.board.width, self.board.height))
+
+            with open(self.index, 'wb'):
+                pass
+
+            self.end = HEADER.size
+            return
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        magic, version, width, height = HEADER.unpack_from(data)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a version %d game journal' % VERSION)
+
+        if (width, height) != (self.board.width, self.board.height):
+            raise ValueError('game journal is for a %dx%d board' % (width, height))
+
+        offsets = []
+
+        if os.path.exists(self.index):
+            with open(self.index, 'rb') as f:
+                raw = f.read()
+
+            offsets = [n for (n,) in OFFSET.iter_unpack(raw[:len(raw) - len(raw) % OFFSET.size])]
+
+        # Index entries pointing past the end of the journal are dropped
+        while offsets and decode(data, offsets[-1]) is None:
+            offsets.pop()
+
+        offset = decode(data, offsets[-1])[1] if offsets else HEADER.size
+        found  = decode(data, offset)
+
+        # Games written to the journal but not the index are added to it
+        while found:
+            offsets.append(offset)
+            offset = found[1]
+            found  = decode(data, offset)
+
+        # Anything after the last whole record was cut short, and is removed
+        if offset < len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+
+        with open(self.index, 'wb') as f:
+            f.write(b''.join(OFFSET.pack(n) for n in offsets))
+
+        self.written = len(offsets)
+        self.end     = offset
+
+
+    def record(self, winner, reason, moves, decisions):
+        '''Adds a finished game to the journal
+
+           Parameters:
+           winner    = 'w' or 'b'
+           reason    = 'captured', 'reached' or 'stalemate'
+           moves     = list of (from, to) moves in the order they were played (PASS for a pass)
+           decisions = list of the AI's (database line, colour) decisions
+        '''
+
+        self.pending.append(self.end + len(self.buffer))
+        self.buffer += encode(winner, reason, moves, decisions)
+
+        if len(self.buffer) >= self.size or len(self.pending) >= self.every:
+            self.flush()
+
+
+    def flush(self):
+        '''Writes every waiting game to the journal, then to the index'''
+
+        if not self.pending:
+            return
+
+        self.data.write(self.buffer)
+        self.data.flush()
+
+        self.idx.write(b''.join(OFFSET.pack(n) for n in self.pending))
+        self.idx.flush()
+
+        self.end     += len(self.buffer)
+        self.written += len(self.pending)
+        self.buffer   = bytearray()
+        self.pending  = []
+
+
+    def close(self):
+        '''Writes every waiting game and closes the files'''
+
+        if self.data.closed:
+            return
+
+        self.flush()
+        self.data.close()
+        self.idx.close()
+
+
+    def read(self, n):
+        '''Reads one game from the journal, using the index to find it
+
+           Parameters:
+           n = number of the game, the first one is 0
+
+           Returns:
+           (winner, reason, moves, decisions)
+        '''
+
+        if n >= self.written:
+            self.flush()
+
+        if not 0 <= n < self.written:
+            raise IndexError('no game %d in the journal' % n)
+
+        with open(self.index, 'rb') as f:
+            f.seek(n * OFFSET.size)
+            offset = OFFSET.unpack(f.read(OFFSET.size))[0]
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            head = f.read(RECORD.size)
+            size, chosen = RECORD.unpack(head)[2:]
+            body = f.read(2 * size + DECISION.size * chosen)
+
+        return decode(head + body, 0)[0]
+
+
+    def __iter__(self):
+
+        self.flush()
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        found = decode(data, HEADER.size)
+
+        while found:
+            yield found[0]
+            found = decode(data, found[1])
+
+
+
+def replay(journal, store, learning='fast'):
+    '''Trains an AI database on the games in a journal, as if they were played again
+
+       Only the AI's last decision in each game is learned from, the same as
+       answering "Yes" to "Update Database?" after it.
+
+       Parameters:
+       journal  = Journal to read the games from
+       store    = MatchboxStore to train (call store.flush() to save it)
+       learning = 'fast' learns from the AI's losses, 'slow' from its wins
+
+       Returns:
+       Number of games learned from
+    '''
+
+    learned = 0
+
+    for winner, reason, moves, decisions in journal:
+
+        if not decisions:
+            continue
+
+        if (winner == 'w' and learning == 'fast') or (winner == 'b' and learning == 'slow'):
+            store.learn(decisions[-1][0], decisions[-1][1], learning)
+            learned += 1
+
+    return learned
@@ -0,0 +1,431 @@
+#-----------------------------------------------------------------------------
+# Name:        Matchbox Store (matchbox.py)
+# Purpose:     In-memory copy of the AI database shared by choose, learn and forget
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# The AI database is read once and kept in memory. Nothing on the move path
+# touches the disk: changes are only written out when flush() is called, and
+# the file is only checked for outside edits when refresh() is called.
+#
+# A flush writes the whole database to a temporary file next to it, syncs it
+# to disk and renames it over the old file, so a crash part way through
+# leaves either the old database or the new one, never half of one. With a
+# batch size above 1, flush() waits until that many updates have been made
+# (anything left over is written when Python exits).
+#
+# In memory, every state is a list of bead counts, one per colour in
+# COLOURS. Databases can be kept in two formats, picked by file extension:
+#
+#   .txt        The original format, one line of bead letters per state
+#               (a count of 3 blue beads is written BBB)
+#
+#   anything    Binary format: the 4 bytes HXMB, a format version byte, the
+#   else        number of states (2 bytes), the number of colours (1 byte)
+#               and their letters, then every state's counts as 4 byte
+#               unsigned integers. Everything is little-endian.
+#
+# Beads are drawn with an alias table for each state (Vose's method, using
+# whole numbers so the odds are exact), which takes one random number and
+# one comparison however the beads are spread. A state's table is built the
+# first time it is drawn from and rebuilt only when that state is changed.
+#
+# Running this file converts between the two:
+#   python matchbox.py AI.txt AI.bin
+#
+#-----------------------------------------------------------------------------
+
+
+import atexit
+import os
+import random as rn
+import stat
+import struct
+import sys
+import tempfile
+
+
+COLOURS = 'BGPR'                        # Bead colours, in the order their counts are stored
+MAGIC   = b'HXMB'                       # First bytes of a binary database
+VERSION = 1                             # Binary format version
+
+
+
+def parse(text):
+    '''Reads bead counts from the text format
+
+       Parameters:
+       text = contents of a text database
+
+       Returns:
+       List containing a list of bead counts for every state
+    '''
+
+    return [[line.count(c) for c in COLOURS] for line in text.splitlines()]
+
+
+
+def render(counts):
+    '''Writes bead counts in the text format
+
+       Parameters:
+       counts = list containing a list of bead counts for every state
+
+       Returns:
+       Contents of a text database
+    '''
+
+    return ''.join(''.join(c * n for c, n in zip(COLOURS, box)) + '\n' for box in counts)
+
+
+
+def unpack(data):
+    '''Reads bead counts from the binary format
+
+       Parameters:
+       data = contents of a binary database
+
+       Returns:
+       List containing a list of bead counts for every state
+    '''
+
+    magic, version, states, width = struct.unpack_from('<4sBHB', data)
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not a version %d matchbox database' % VERSION)
+
+    colours = data[8:8 + width].decode('ascii')
+    flat    = struct.unpack_from('<%dI' % (states * width), data, 8 + width)
+    counts  = []
+
+    for n in range(states):
+        box = dict(zip(colours, flat[n * width:(n + 1) * width]))
+        counts.append([box.get(c, 0) for c in COLOURS])
+
+    return counts
+
+
+
+def pack(counts):
+    '''Writes bead counts in the binary format
+
+       Parameters:
+       counts = list containing a list of bead counts for every state
+
+       Returns:
+       Contents of a binary database
+    '''
+
+    flat = [n for box in counts for n in box]
+
+    return (struct.pack('<4sBHB', MAGIC, VERSION, len(counts), len(COLOURS))
+            + COLOURS.encode('ascii') + struct.pack('<%dI' % len(flat), *flat))
+
+
+
+def alias(box):
+    '''Builds the alias table for a state's bead counts
+
+       Parameters:
+       box = list of bead counts, in COLOURS order
+
+       Returns:
+       (total, cutoffs, aliases) where a draw r from 0 to total * len(box) - 1
+       picks column r // total, and keeps it if r % total is below its cutoff,
+       otherwise takes its alias
+    '''
+
+    n       = len(box)
+    total   = sum(box)
+    scaled  = [c * n for c in box]          # Each column holds exactly total
+    cutoffs = [total] * n
+    aliases = list(range(n))
+    small   = [i for i in range(n) if scaled[i] < total]
+    large   = [i for i in range(n) if scaled[i] >= total]
+
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+
+        cutoffs[s] = scaled[s]
+        aliases[s] = l
+        scaled[l] -= total - scaled[s]
+
+        if scaled[l] < total:
+            small.append(l)
+        else:
+            large.append(l)
+
+    return total, cutoffs, aliases
+
+
+
+def draw(table, rng=rn):
+    '''Draws a random bead from an alias table
+
+       Columns with no beads have a cutoff of 0, so they are never drawn.
+
+       Parameters:
+       table = (total, cutoffs, aliases) made by alias()
+       rng   = random number generator to draw with
+
+       Returns:
+       Column of the bead that was drawn
+    '''
+
+    total, cutoffs, aliases = table
+    r = rng.randrange(total * len(cutoffs))
+    i = r // total
+
+    if r % total < cutoffs[i]:
+        return i
+
+    return aliases[i]
+
+
+
+def isText(path):
+    '''Checks if a database file uses the text format'''
+
+    return path.lower().endswith('.txt')
+
+
+
+def read(path):
+    '''Reads an AI database file in either format
+
+       Parameters:
+       path = file to be read
+
+       Returns:
+       List containing a list of bead counts for every state
+    '''
+
+    if isText(path):
+        with open(path) as f:
+            return parse(f.read())
+
+    with open(path, 'rb') as f:
+        return unpack(f.read())
+
+
+
+def replace(path, data):
+    '''Safely replaces a file, so it is either left as it was or fully written
+
+       Parameters:
+       path = file to be written
+       data = bytes to write to it
+    '''
+
+    folder   = os.path.dirname(os.path.abspath(path))
+    fd, temp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=folder)
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Keep the permissions of the file being replaced, new files get the usual ones
+        if os.path.exists(path):
+            os.chmod(temp, stat.S_IMODE(os.stat(path).st_mode))
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp, 0o666 & ~umask)
+
+        os.replace(temp, path)
+
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+
+
+def write(path, counts):
+    '''Safely replaces an AI database file, in the format its extension calls for
+
+       Parameters:
+       path   = file to be written
+       counts = list containing a list of bead counts for every state
+    '''
+
+    if isText(path):
+        replace(path, render(counts).replace('\n', os.linesep).encode('ascii'))
+    else:
+        replace(path, pack(counts))
+
+
+
+class MatchboxStore:
+    '''Loaded-once store of the AI's matchboxes (bead counts for every state)
+
+       Parameters:
+
+       path    = file the AI database is kept in
+       default = file the AI database is reset from by forget()
+       batch   = number of updates to collect before flush() writes them
+       cap     = most beads slow learning can fill a matchbox with (None for no limit)
+       rng     = random number generator beads are drawn with (the random module by default)
+    '''
+
+    def __init__(self, path="AI.txt", default="AI Default.txt", batch=1, cap=9, rng=rn):
+
+        self.path    = path
+        self.default = default
+        self.batch   = batch
+        self.cap     = cap
+        self.rng     = rng
+        self.counts  = []                   # Bead counts of each state, in COLOURS order
+        self.tables  = []                   # Alias table of each state, None until first drawn from
+        self.stamp   = None                 # (mtime, size) of the file when last loaded or flushed
+        self.dirty   = False                # Control variable checking for unsaved changes
+        self.pending = 0                    # Number of updates since the last write
+
+        self.load()
+
+        if batch > 1:
+            atexit.register(self.flush, True)
+
+
+    def status(self):
+        '''Returns the (mtime, size) stamp of the database file, or None if it is missing'''
+
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+
+        return (st.st_mtime_ns, st.st_size)
+
+
+    def load(self):
+        '''Loads the database file into memory, discarding unsaved changes'''
+
+        self.counts  = read(self.path)
+        self.tables  = [None] * len(self.counts)
+        self.stamp   = self.status()
+        self.dirty   = False
+        self.pending = 0
+
+
+    def changed(self):
+        '''Checks if the database file was changed since it was last loaded or flushed'''
+
+        return self.status() != self.stamp
+
+
+    def refresh(self):
+        '''Reloads the database if the file was changed by something else
+
+           Unsaved changes are kept, and will overwrite the file on the next flush.
+
+           Returns:
+           True if the database was reloaded
+        '''
+
+        if self.dirty or not self.changed():
+            return False
+
+        self.load()
+        return True
+
+
+    def choose(self, indx, rng=None):
+        '''Draws a random bead from a state's matchbox
+
+           Parameters:
+           indx = the state to choose from (the line # in the AI database)
+           rng  = random number generator to draw with (the store's own by default)
+
+           Returns:
+           Colour of the bead that was drawn
+        '''
+
+        table = self.tables[indx]
+
+        if table is None:
+            table = self.tables[indx] = alias(self.counts[indx])
+
+        return COLOURS[draw(table, rng or self.rng)]
+
+
+    def learn(self, indx, colour, learning):
+        '''Updates a state's matchbox after a game
+
+           Parameters:
+           indx     = the state that was played (the line # in the AI database)
+           colour   = the bead that was drawn in that state
+           learning = 'fast' removes the bead, 'slow' adds another one
+        '''
+
+        box   = self.counts[indx]
+        i     = COLOURS.index(colour)
+        total = sum(box)
+
+        if learning == 'fast' and total > 1 and box[i]:
+            box[i] -= 1
+
+        elif learning == 'slow' and (self.cap is None or total < self.cap):
+            box[i] += 1
+
+        else:
+            return
+
+        self.tables[indx] = None
+        self.dirty        = True
+        self.pending     += 1
+
+
+    def assign(self, counts, updates=1):
+        '''Replaces every state's bead counts at once, as after a batch of games
+
+           Parameters:
+           counts  = list containing a list of bead counts for every state
+           updates = number of updates the new counts stand for
+        '''
+
+        self.counts   = [list(box) for box in counts]
+        self.tables   = [None] * len(self.counts)
+        self.dirty    = True
+        self.pending += updates
+
+
+    def forget(self):
+        '''Replaces the database with the default one'''
+
+        self.counts  = read(self.default)
+        self.tables  = [None] * len(self.counts)
+        self.dirty   = True
+        self.pending = self.batch
+
+
+    def flush(self, force=False):
+        '''Writes unsaved changes to the database file
+
+           Parameters:
+           force = write even if fewer than batch updates are waiting
+        '''
+
+        if not self.dirty or (self.pending < self.batch and not force):
+            return
+
+        write(self.path, self.counts)
+
+        self.stamp   = self.status()
+        self.dirty   = False
+        self.pending = 0
+
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) != 3:
+        sys.exit('Usage: python matchbox.py SOURCE DESTINATION')
+
+    write(sys.argv[2], read(sys.argv[1]))
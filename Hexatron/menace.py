@@ -0,0 +1,273 @@
+#-----------------------------------------------------------------------------
+# Name:        Matchbox AI For Any Board (menace.py)
+# Purpose:     Trains the matchbox AI on bigger boards (Octapawn 4x4, 5x5 and beyond)
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# The 3x3 game uses a hand-made list of states (states.py) and four bead
+# colours. On bigger boards there are far too many boards to list by hand,
+# so here every board the computer (black) is asked to move on gets its own
+# matchbox the first time it is seen:
+#
+#   - A board and its mirror image share one matchbox. Boards are filed
+#     under whichever of the two has the smaller Zobrist hash, which every
+#     Position keeps up to date for both sides as moves are played, so
+#     finding a matchbox never builds a key or flips a board.
+#   - A matchbox holds one bead count for each legal move on that side of
+#     the board, in the order Position.moves() lists them, starting at
+#     BEADS each. The moves are worked out once, when it is made.
+#
+# Learning works as it does in the game, using the same training loop as
+# selfplay.py: only the last move the AI made is changed, a bead is taken
+# away when it loses with fast learning (never the last bead in the
+# matchbox, so a losing move can run out of beads and is never drawn
+# again) and one is added when it wins with slow learning.
+#
+# Matchboxes are saved in a binary file: the 4 bytes HXNM, a format version
+# byte, the board width and height (1 byte each) and the number of
+# matchboxes (4 bytes), then for every matchbox its white and black masks
+# (as many bytes as the board needs), the number of moves (1 byte) and the
+# bead count of each move (4 bytes each). Everything is little-endian.
+#
+# Usage:
+#   python menace.py [--size 4x4] [-n GAMES] [--learning fast|slow]
+#                    [--white random|first] [--db FILE] [--seed N]
+#
+#-----------------------------------------------------------------------------
+
+
+import argparse
+import random as rn
+import struct
+
+from board import Position, shape
+from matchbox import alias, draw, replace
+from selfplay import BASIC, train
+
+
+MAGIC   = b'HXNM'                       # First bytes of a matchbox file
+VERSION = 2                             # Matchbox file format version
+HEADER  = struct.Struct('<4sBBBI')      # Start of a matchbox file
+BEADS   = 3                             # Beads each move starts with
+
+
+
+class Matchboxes:
+    '''Matchbox AI for any board size, making a matchbox for each board as it is seen
+
+       Parameters:
+
+       board = Board the AI plays on
+       beads = number of beads each move starts with
+       cap   = most beads slow learning can fill a matchbox with (None for no limit)
+       rng   = random number generator beads are drawn with (the random module by default)
+    '''
+
+    def __init__(self, board, beads=BEADS, cap=None, rng=rn):
+
+        self.board  = board
+        self.beads  = beads
+        self.cap    = cap
+        self.rng    = rng
+        self.boxes  = {}                    # (bead counts, moves, (white, black) masks) of each matchbox, by hash
+        self.tables = {}                    # Alias table of each matchbox, made when it is first drawn from
+
+
+    def __len__(self):
+
+        return len(self.boxes)
+
+
+    def box(self, pos):
+        '''Finds the matchbox for a position, filling a new one with beads the first time its board is seen
+
+           Parameters:
+           pos = Position the computer is to move in
+
+           Returns:
+           (key, True if the board is mirrored in the matchbox, (bead counts, moves, masks))
+        '''
+
+        flipped = pos.mirrored < pos.code
+        key     = pos.mirrored if flipped else pos.code
+        box     = self.boxes.get(key)
+
+        if box is None:
+            side  = pos.mirror() if flipped else pos
+            moves = side.moves()
+            box   = self.boxes[key] = ([self.beads] * len(moves), moves, (side.white, side.black))
+
+        return key, flipped, box
+
+
+    def choose(self, pos, rng=None):
+        '''Draws a bead to pick the computer's move
+
+           Parameters:
+           pos = Position the computer is to move in (with a move left to make)
+           rng = random number generator to draw with (the matchboxes' own by default)
+
+           Returns:
+           (key, bead, (from, to)) where key and bead are what learn() needs
+        '''
+
+        key, flipped, (counts, moves, masks) = self.box(pos)
+        table = self.tables.get(key)
+
+        if table is None:
+            table = self.tables[key] = alias(counts)
+
+        i       = draw(table, rng or self.rng)
+        frm, to = moves[i]
+
+        if flipped:
+            frm, to = self.board.beside(frm), self.board.beside(to)
+
+        return key, i, (frm, to)
+
+
+    def move(self, pos, rng=None):
+        '''Makes the computer's move, for selfplay.train()
+
+           Parameters:
+           pos = Position the computer is to move in (with a move left to make)
+           rng = random number generator to draw with (the matchboxes' own by default)
+
+           Returns:
+           ((key, bead), position after the move) where key and bead are what learn() needs
+        '''
+
+        key, bead, (frm, to) = self.choose(pos, rng)
+
+        return (key, bead), pos.play(frm, to)
+
+
+    def learn(self, key, bead, learning):
+        '''Updates a matchbox after a game
+
+           Parameters:
+           key      = matchbox the move was drawn from
+           bead     = the move's place in the matchbox
+           learning = 'fast' removes a bead, 'slow' adds another one
+        '''
+
+        counts = self.boxes[key][0]
+        total  = sum(counts)
+
+        if learning == 'fast' and total > 1 and counts[bead]:
+            counts[bead] -= 1
+
+        elif learning == 'slow' and (self.cap is None or total < self.cap):
+            counts[bead] += 1
+
+        else:
+            return
+
+        self.tables.pop(key, None)
+
+
+    def pack(self):
+        '''Writes the matchboxes in the binary format
+
+           Returns:
+           Contents of a matchbox file
+        '''
+
+        width = (self.board.size + 7) // 8
+        out   = [HEADER.pack(MAGIC, VERSION, self.board.width, self.board.height, len(self.boxes))]
+
+        for counts, moves, (white, black) in sorted(self.boxes.values(), key=lambda box: box[2]):
+            out.append(white.to_bytes(width, 'little') + black.to_bytes(width, 'little'))
+            out.append(struct.pack('<B%dI' % len(counts), len(counts), *counts))
+
+        return b''.join(out)
+
+
+    def unpack(self, data):
+        '''Reads matchboxes from the binary format, replacing any already made
+
+           Parameters:
+           data = contents of a matchbox file for the same board size
+        '''
+
+        magic, version, w, h, size = HEADER.unpack_from(data)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a version %d matchbox file' % VERSION)
+
+        if (w, h) != (self.board.width, self.board.height):
+            raise ValueError('matchbox file is for a %dx%d board' % (w, h))
+
+        width  = (self.board.size + 7) // 8
+        offset = HEADER.size
+        boxes  = {}
+
+        for n in range(size):
+            white   = int.from_bytes(data[offset:offset + width], 'little')
+            black   = int.from_bytes(data[offset + width:offset + 2 * width], 'little')
+            offset += 2 * width
+            length  = data[offset]
+            counts  = list(struct.unpack_from('<%dI' % length, data, offset + 1))
+            offset += 1 + 4 * length
+            pos     = Position(white, black, 'b', self.board)
+            boxes[pos.code] = (counts, pos.moves(), (white, black))
+
+        self.boxes  = boxes
+        self.tables = {}
+
+
+    def load(self, path):
+        '''Reads the matchboxes from a file'''
+
+        with open(path, 'rb') as f:
+            self.unpack(f.read())
+
+
+    def save(self, path):
+        '''Safely writes the matchboxes to a file'''
+
+        replace(path, self.pack())
+
+
+
+def main():
+    '''Trains the matchbox AI on any board size from the command line'''
+
+    parser = argparse.ArgumentParser(description='Train the Hexatron AI on a board of any size')
+    parser.add_argument('--size',         default='4x4',                   help='board size, WIDTHxHEIGHT')
+    parser.add_argument('-n', '--games',  type=int, default=10000,         help='number of games to play')
+    parser.add_argument('--learning',     choices=('fast', 'slow'),        default='fast')
+    parser.add_argument('--white',        choices=sorted(BASIC),           default='random',
+                        help='player the AI is trained against')
+    parser.add_argument('--db',                                            help='matchbox file to load and save')
+    parser.add_argument('--seed',         type=int,                        help='seed for reproducible runs')
+    args = parser.parse_args()
+
+    width, height = (int(n) for n in args.size.lower().split('x'))
+
+    rng   = rn.Random(args.seed)
+    boxes = Matchboxes(shape(width, height))
+
+    if args.db:
+        try:
+            boxes.load(args.db)
+        except FileNotFoundError:
+            pass
+
+    stats = train(boxes, args.games, BASIC[args.white](rng), args.learning, rng,
+                  Matchboxes.move, Position(board=boxes.board))
+
+    if args.db:
+        boxes.save(args.db)
+
+    print('%dx%d board, %d matchboxes' % (width, height, len(boxes)))
+    print('%d games in %.3fs (%.0f games/sec)' % (stats['games'], stats['seconds'], stats['rate']))
+    print('Player won %d, AI won %d (%.1f%%)' % (stats['player'], stats['ai'], 100 * stats['ai'] / stats['games']))
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+#-----------------------------------------------------------------------------
+# Name:        Frame Profiler (profiler.py)
+# Purpose:     Times each phase of the game's frames, to find what makes a frame slow
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Parts of the game are wrapped in a timer with the name of their phase:
+#
+#   with profile('grid'):
+#       ...
+#
+# The time each phase takes is added up over a frame, including anything
+# done by the mouse and keyboard functions since the frame before, and
+# kept when frame() is called at the end of it. The last WINDOW frames are
+# kept for every phase, to give its median, p95 and slowest time, and a
+# histogram of every frame since the game started is kept as well.
+#
+# Pygame Zero only draws a frame after a mouse or keyboard event, so the
+# time between two frames is mostly the player thinking. The 'frame' phase
+# is instead the work done for a frame: from begin(), called when an event
+# is handled or a frame starts drawing, to the end of the frame. This is
+# what the player waits for after a click, and where slow frames show up.
+#
+# When the profiler is off the timers do nothing, so it can be left in the
+# game. dump() writes every phase's times to a CSV file.
+#
+#-----------------------------------------------------------------------------
+
+
+import csv
+import statistics as st
+import time as t
+
+from collections import deque
+from contextlib import nullcontext
+
+
+WINDOW = 300                            # Frames kept for each phase (5 seconds at 60 frames/sec)
+EDGES  = (1, 2, 4, 8, 16, 33, 66)       # Histogram bucket edges, in milliseconds
+
+
+
+def bucket(ms):
+    '''Finds the histogram bucket of a time
+
+       Parameters:
+       ms = time in milliseconds
+
+       Returns:
+       Number of the bucket, len(EDGES) for times past the last edge
+    '''
+
+    for n, edge in enumerate(EDGES):
+        if ms < edge:
+            return n
+
+    return len(EDGES)
+
+
+
+class Timer:
+    '''Adds the time taken inside a with statement to a phase of the current frame'''
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+
+        self.profiler = profiler
+        self.name     = name
+
+
+    def __enter__(self):
+
+        self.profiler.begin()
+        self.start = t.perf_counter()
+
+
+    def __exit__(self, *exc):
+
+        self.profiler.add(self.name, t.perf_counter() - self.start)
+
+
+
+class Profiler:
+    '''Per-phase frame timers, with rolling statistics and histograms
+
+       Parameters:
+
+       on     = True to time the phases, the timers do nothing otherwise
+       window = number of frames kept for each phase
+    '''
+
+    def __init__(self, on=False, window=WINDOW):
+
+        self.on      = on
+        self.window  = window
+        self.idle    = nullcontext()        # Timer used when the profiler is off
+        self.times   = {}                   # Milliseconds of each phase over the last frames, by phase
+        self.counts  = {}                   # Histogram of each phase over every frame, by phase
+        self.current = {}                   # Seconds of each phase so far this frame
+        self.start   = None                 # perf_counter() when work on this frame began, None before then
+        self.frames  = 0                    # Number of frames timed
+
+
+    def __call__(self, name):
+
+        return Timer(self, name) if self.on else self.idle
+
+
+    def add(self, name, seconds):
+        '''Adds time to a phase of the current frame
+
+           Parameters:
+           name    = phase
+           seconds = time taken
+        '''
+
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+
+    def begin(self):
+        '''Starts timing the work done for the next frame, if it hasn't been started already'''
+
+        if self.on and self.start is None:
+            self.start = t.perf_counter()
+
+
+    def frame(self):
+        '''Ends the current frame, keeping the time of every phase that happened in it'''
+
+        if not self.on:
+            return
+
+        self.begin()
+        self.add('frame', t.perf_counter() - self.start)
+
+        for name, seconds in self.current.items():
+            ms = 1000 * seconds
+
+            if name not in self.times:
+                self.times[name]  = deque(maxlen=self.window)
+                self.counts[name] = [0] * (len(EDGES) + 1)
+
+            self.times[name].append(ms)
+            self.counts[name][bucket(ms)] += 1
+
+        self.current = {}
+        self.start   = None
+        self.frames += 1
+
+
+    def stats(self, name):
+        '''Works out a phase's times over the last frames
+
+           Parameters:
+           name = phase
+
+           Returns:
+           (frames, median, p95, slowest) with the times in milliseconds
+        '''
+
+        ordered = sorted(self.times[name])
+        p95     = ordered[max(0, -(-len(ordered) * 95 // 100) - 1)]
+
+        return len(ordered), st.median(ordered), p95, ordered[-1]
+
+
+    def histogram(self, name):
+        '''Counts a phase's times over the last frames in the histogram buckets
+
+           Parameters:
+           name = phase
+
+           Returns:
+           List of the number of frames in each bucket
+        '''
+
+        out = [0] * (len(EDGES) + 1)
+
+        for ms in self.times[name]:
+            out[bucket(ms)] += 1
+
+        return out
+
+
+    def rows(self):
+        '''Writes the table shown in the game's overlay
+
+           Returns:
+           List of rows of text, a heading then one row per phase (the frame phase first)
+        '''
+
+        out = [['phase', 'p50', 'p95', 'max ms']]
+
+        for name in sorted(self.times, key=lambda name: (name != 'frame', name)):
+            frames, median, p95, most = self.stats(name)
+            out.append([name, '%.2f' % median, '%.2f' % p95, '%.2f' % most])
+
+        return out
+
+
+    def spread(self):
+        '''Writes the histogram of the frame phase over the last frames as one line of text'''
+
+        if 'frame' not in self.times:
+            return ''
+
+        labels = ['<%d' % edge for edge in EDGES] + ['>%d' % EDGES[-1]]
+
+        return ' '.join('%s:%d' % pair for pair in zip(labels, self.histogram('frame')))
+
+
+    def dump(self, path):
+        '''Writes every phase's times to a CSV file
+
+           The median, p95 and slowest times are over the last frames, the
+           histogram is over every frame since the game started.
+
+           Parameters:
+           path = CSV file to write
+        '''
+
+        if not self.times:
+            return
+
+        with open(path, 'w', newline='') as f:
+            out = csv.writer(f)
+            out.writerow(['phase', 'frames', 'p50 ms', 'p95 ms', 'max ms']
+                         + ['<%d ms' % edge for edge in EDGES] + ['>=%d ms' % EDGES[-1]])
+
+            for name in sorted(self.times):
+                frames, median, p95, most = self.stats(name)
+                out.writerow([name, sum(self.counts[name]), '%.3f' % median, '%.3f' % p95, '%.3f' % most]
+                             + self.counts[name])
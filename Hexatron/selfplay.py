@@ -0,0 +1,238 @@
+#-----------------------------------------------------------------------------
+# Name:        Headless Self-Play (selfplay.py)
+# Purpose:     Trains the AI database without opening the game window
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Plays the matchbox AI (black) against a computer-controlled player (white)
+# using only the bitboard and the AI states table, so no screen, Actor or
+# Rect is needed. After every game the database is updated the same way as
+# answering "Yes" to "Update Database?":
+#
+#   fast learning - the AI's last bead is removed when the AI loses
+#   slow learning - the AI's last bead is doubled up when the AI wins
+#
+# menace.py trains its matchboxes for bigger boards with the same train(),
+# passing in its own move function and starting position.
+#
+# Usage:
+#   python selfplay.py [-n GAMES] [--learning fast|slow] [--white random|first|perfect]
+#                      [--db AI.txt] [--seed N]
+#
+#-----------------------------------------------------------------------------
+
+
+import argparse
+import random as rn
+import time as t
+
+from board import Position, across
+from matchbox import MatchboxStore
+from solver import best, score
+from states import lookup
+
+
+
+def randomPlayer(rng=rn):
+    '''Makes a player that picks any legal move at random
+
+       Parameters:
+       rng = random number generator to pick with
+
+       Returns:
+       Function taking a Position and returning a (from, to) move
+    '''
+
+    return lambda pos: rng.choice(pos.moves())
+
+
+
+def firstMove(pos):
+    '''Scripted player that always makes the first legal move (lowest spaces first)'''
+
+    return pos.moves()[0]
+
+
+
+def matchboxPlayer(store, rng=rn):
+    '''Makes a player that plays white using an AI database
+
+       The board is turned around so the AI sees it from black's side. Boards
+       the AI doesn't know (including the very first move) are played at random.
+
+       Parameters:
+       store = MatchboxStore to choose moves from (it is not updated)
+       rng   = random number generator to draw beads and random moves with
+
+       Returns:
+       Function taking a Position and returning a (from, to) move
+    '''
+
+    def player(pos):
+
+        state = lookup(pos.swap())
+
+        if state:
+            indx, moves = state
+            colour      = store.choose(indx, rng)
+
+            if colour in moves:
+                frm, to = moves[colour]
+                return across(frm), across(to)
+
+        return rng.choice(pos.moves())
+
+    return player
+
+
+
+# Players that can play on any board size, and every player that can be chosen from the command line
+BASIC   = {'random' : randomPlayer, 'first' : lambda rng: firstMove}
+PLAYERS = dict(BASIC, perfect=lambda rng: best)
+
+
+
+def databaseMove(store, pos, rng=rn):
+    '''Makes the AI's move on the 3x3 board, drawing a bead from the AI database
+
+       Parameters:
+       store = MatchboxStore the AI chooses its moves from
+       pos   = Position the computer is to move in
+       rng   = random number generator to draw with
+
+       Returns:
+       ((indx, colour), position after the move) where indx and colour are
+       what store.learn() needs, or (None, None) if the AI doesn't know the
+       board and gives up
+    '''
+
+    state = lookup(pos)
+
+    if state is None:
+        return None, None
+
+    indx, moves = state
+    colour      = store.choose(indx, rng)
+
+    if colour in moves:
+        return (indx, colour), pos.play(*moves[colour])
+
+    return (indx, colour), Position(pos.white, pos.black, 'w')
+
+
+
+def playGame(store, white, rng=rn, ai=databaseMove, start=None):
+    '''Plays one game between a player and the AI
+
+       Parameters:
+       store = the AI's matchboxes (a MatchboxStore for the 3x3 board)
+       white = function taking a Position and returning the player's (from, to) move
+       rng   = random number generator the AI draws beads with
+       ai    = function taking (store, Position, rng) and making the AI's move, as databaseMove() does
+       start = Position the game starts from (the 3x3 board by default)
+
+       Returns:
+       (winner, indx, colour) where winner is 'w' or 'b', and indx and colour
+       are the AI's last decision (None if it never chose a move)
+    '''
+
+    pos  = start or Position()
+    last = (None, None)
+
+    while True:
+
+        # Player's move
+        frm, to = white(pos)
+        pos     = pos.play(frm, to)
+        end     = pos.outcome()
+
+        if end:
+            return (end[0],) + last
+
+        # Computer's move, the AI gives up on boards it doesn't know
+        decision, pos = ai(store, pos, rng)
+
+        if decision is None:
+            return ('w',) + last
+
+        last = decision
+        end  = pos.outcome()
+
+        if end:
+            return (end[0],) + last
+
+
+
+def train(store, games, white, learning='fast', rng=rn, ai=databaseMove, start=None):
+    '''Plays many games, updating the AI's matchboxes after each one
+
+       The matchboxes are only changed in memory, call store.flush() to save a MatchboxStore.
+
+       Parameters:
+       store    = the AI's matchboxes, anything with learn(indx, colour, learning)
+       games    = number of games to play
+       white    = function taking a Position and returning the player's (from, to) move
+       learning = 'fast' or 'slow', as on the options screen
+       rng      = random number generator the AI draws beads with
+       ai       = function making the AI's move, as in playGame()
+       start    = Position every game starts from (the 3x3 board by default)
+
+       Returns:
+       Dictionary of the number of games won by each side, the time taken and games/sec
+    '''
+
+    wins  = {'w' : 0, 'b' : 0}
+    start = start or Position()
+    begin = t.perf_counter()
+
+    for n in range(games):
+        winner, indx, colour = playGame(store, white, rng, ai, start)
+        wins[winner] += 1
+
+        if indx is None:
+            continue
+
+        if winner == 'w' and learning == 'fast':
+            store.learn(indx, colour, 'fast')
+
+        elif winner == 'b' and learning == 'slow':
+            store.learn(indx, colour, 'slow')
+
+    seconds = t.perf_counter() - begin
+
+    return {'games'   : games,
+            'player'  : wins['w'],
+            'ai'      : wins['b'],
+            'seconds' : seconds,
+            'rate'    : games / seconds if seconds else float('inf')}
+
+
+
+def main():
+    '''Trains the AI database from the command line'''
+
+    parser = argparse.ArgumentParser(description='Train the Hexatron AI without the game window')
+    parser.add_argument('-n', '--games',  type=int, default=1000,          help='number of games to play')
+    parser.add_argument('--learning',     choices=('fast', 'slow'),        default='fast')
+    parser.add_argument('--white',        choices=sorted(PLAYERS),         default='random',
+                        help='player the AI is trained against')
+    parser.add_argument('--db',           default='AI.txt',                help='AI database to train')
+    parser.add_argument('--seed',         type=int,                        help='seed for reproducible runs')
+    args = parser.parse_args()
+
+    rng   = rn.Random(args.seed)
+    store = MatchboxStore(args.db)
+    stats = train(store, args.games, PLAYERS[args.white](rng), args.learning, rng)
+    store.flush()
+
+    print('%d games in %.3fs (%.0f games/sec)' % (stats['games'], stats['seconds'], stats['rate']))
+    print('Player won %d, AI won %d (%.1f%%)' % (stats['player'], stats['ai'], 100 * stats['ai'] / stats['games']))
+    print('AI picks a winning move %.1f%% of the time' % (100 * score(store)))
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#-----------------------------------------------------------------------------
+# Name:        Hexapawn Solver (solver.py)
+# Purpose:     Exact win/loss and distance to the end of every reachable position
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Every position that can be reached from the start is found by playing
+# every legal move, then solved backwards from the positions where the game
+# is over (retrograde analysis). A finished game is worth 0 moves to its
+# winner. Working back one move at a time, a position is won for the side
+# to move as soon as one of its moves leads to a won position for it, and
+# lost once every one of its moves leads to a won position for the other
+# side. Since positions are reached in order of distance, winners take the
+# quickest win and losers hold out for as long as they can.
+#
+# Hexapawn can't be drawn (every move takes a pawn forward), so every
+# position ends up won by one side.
+#
+# Boards too big to solve completely can be searched one position at a time
+# with search(), which gives the same answers and remembers the positions
+# it has solved in a fixed-size transposition table.
+#
+# The solution is kept in a small binary file next to this one, loaded on
+# import. If it is missing or out of date the game is solved again in
+# memory. Running this file solves the game and rewrites the file:
+#   python solver.py
+#
+# File format: the 4 bytes HXSV, a format version byte and the number of
+# positions (4 bytes), then for every position its white mask and black mask
+# (2 bytes each), the side to move, the winner (0 for white, 1 for black)
+# and the number of moves until the game ends (1 byte each). Everything is
+# little-endian.
+#
+#-----------------------------------------------------------------------------
+
+
+import os
+import struct
+
+from board import Position
+from matchbox import COLOURS, replace
+from transposition import TranspositionTable
+
+
+MAGIC   = b'HXSV'                       # First bytes of a solution file
+VERSION = 1                             # Solution file format version
+RECORD  = struct.Struct('<HHBBB')       # One solved position
+CACHE   = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Solution.bin')
+
+SIDES   = 'wb'                          # Sides, in the order they are numbered in the file
+
+
+
+def reachable(start=None):
+    '''Finds every position that can be reached by legal moves
+
+       Parameters:
+       start = Position to search from (the start of the game by default)
+
+       Returns:
+       (positions, parents) where positions is a list of every position found
+       and parents maps each position to the positions one move before it
+    '''
+
+    start     = start or Position()
+    positions = [start]
+    parents   = {start : []}
+
+    for pos in positions:
+
+        if pos.outcome():
+            continue
+
+        for frm, to in pos.moves():
+            after = pos.play(frm, to)
+
+            if after not in parents:
+                parents[after] = []
+                positions.append(after)
+
+            parents[after].append(pos)
+
+    return positions, parents
+
+
+
+def solve(start=None):
+    '''Solves every reachable position by retrograde analysis
+
+       Parameters:
+       start = Position to search from (the start of the game by default)
+
+       Returns:
+       Dictionary of Position to (winner, moves until the game ends)
+    '''
+
+    positions, parents = reachable(start)
+
+    left     = {pos : len(pos.moves()) for pos in positions}
+    table    = {}
+    frontier = []
+
+    for pos in positions:
+        end = pos.outcome()
+
+        if end:
+            table[pos] = (end[0], 0)
+            frontier.append(pos)
+
+    plies = 0
+
+    while frontier:
+        plies += 1
+        ahead  = []
+
+        for pos in frontier:
+            winner = table[pos][0]
+
+            for parent in parents[pos]:
+
+                if parent in table:
+                    continue
+
+                # The side to move picks this move if it wins, and only loses once every move loses
+                left[parent] -= 1
+
+                if winner == parent.turn or not left[parent]:
+                    table[parent] = (winner, plies)
+                    ahead.append(parent)
+
+        frontier = ahead
+
+    return table
+
+
+
+def search(pos, table=None):
+    '''Solves one position by searching every line of play from it
+
+       Positions already solved are looked up by their Zobrist hash in a
+       transposition table, so each one is only searched once while it stays
+       in the table.
+
+       Parameters:
+       pos   = Position to solve (on a board of any size)
+       table = TranspositionTable to share between searches (a new one by default)
+
+       Returns:
+       (winner, moves until the game ends), the same as solve() gives
+    '''
+
+    if table is None:
+        table = TranspositionTable()
+
+    found = table.get(pos.code)
+
+    if found:
+        return found
+
+    end = pos.outcome()
+
+    if end:
+        return end[0], 0
+
+    best   = None
+    result = None
+
+    for frm, to in pos.moves():
+        winner, plies = search(pos.play(frm, to), table)
+
+        # Quickest win first, then the longest loss
+        rank = (0, plies) if winner == pos.turn else (1, -plies)
+
+        if best is None or rank < best:
+            best   = rank
+            result = (winner, plies + 1)
+
+    table.put(pos.code, result, result[1])
+
+    return result
+
+
+
+def pack(table):
+    '''Writes a solution in the binary format
+
+       Parameters:
+       table = dictionary of Position to (winner, moves until the game ends)
+
+       Returns:
+       Contents of a solution file
+    '''
+
+    out = [struct.pack('<4sBI', MAGIC, VERSION, len(table))]
+
+    for pos in sorted(table, key=lambda p: (p.white, p.black, p.turn)):
+        winner, plies = table[pos]
+        out.append(RECORD.pack(pos.white, pos.black, SIDES.index(pos.turn), SIDES.index(winner), plies))
+
+    return b''.join(out)
+
+
+
+def unpack(data):
+    '''Reads a solution from the binary format
+
+       Parameters:
+       data = contents of a solution file
+
+       Returns:
+       Dictionary of Position to (winner, moves until the game ends)
+    '''
+
+    magic, version, size = struct.unpack_from('<4sBI', data)
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not a version %d solution file' % VERSION)
+
+    table = {}
+
+    for white, black, turn, winner, plies in RECORD.iter_unpack(data[9:9 + size * RECORD.size]):
+        table[Position(white, black, SIDES[turn])] = (SIDES[winner], plies)
+
+    return table
+
+
+
+def load(path=CACHE):
+    '''Loads the solution file, or solves the game if it can't be read
+
+       Parameters:
+       path = solution file
+
+       Returns:
+       Dictionary of Position to (winner, moves until the game ends)
+    '''
+
+    try:
+        with open(path, 'rb') as f:
+            return unpack(f.read())
+
+    except (OSError, ValueError, struct.error):
+        return solve()
+
+
+
+SOLUTION = load()
+
+
+
+def value(pos):
+    '''Looks up a position in the solution
+
+       Parameters:
+       pos = Position reachable from the start of the game
+
+       Returns:
+       (winner, moves until the game ends) with perfect play from both sides
+    '''
+
+    return SOLUTION[pos]
+
+
+
+def lost(pos):
+    '''Checks if the side to move loses against perfect play'''
+
+    return SOLUTION[pos][0] != pos.turn
+
+
+
+def best(pos):
+    '''Finds a perfect move, the quickest win or the longest a loss can be held off
+
+       Parameters:
+       pos = Position reachable from the start of the game, with a move left to make
+
+       Returns:
+       (from, to) move
+    '''
+
+    def rank(move):
+        winner, plies = SOLUTION[pos.play(*move)]
+
+        if winner == pos.turn:
+            return (0, plies)
+
+        return (1, -plies)
+
+    return min(pos.moves(), key=rank)
+
+
+
+def score(store, states=None):
+    '''Measures how close an AI database is to playing perfectly
+
+       Parameters:
+       store  = MatchboxStore to measure
+       states = dictionary of (white, black) masks to (AI database line, moves),
+                states.STATES by default
+
+       Returns:
+       Chance that a bead drawn by the AI keeps a won position won, averaged
+       over every position the AI can still win (1.0 is perfect play)
+    '''
+
+    if states is None:
+        from states import STATES as states
+
+    total = 0.0
+    found = 0
+
+    for (white, black), (indx, moves) in states.items():
+        pos = Position(white, black, 'b')
+
+        if pos.outcome() or pos not in SOLUTION or lost(pos):
+            continue
+
+        box  = store.counts[indx]
+        good = sum(box[COLOURS.index(c)] for c in moves
+                   if SOLUTION[pos.play(*moves[c])][0] == 'b')
+
+        total += good / sum(box)
+        found += 1
+
+    return total / found if found else 1.0
+
+
+
+if __name__ == '__main__':
+
+    SOLUTION = solve()
+    replace(CACHE, pack(SOLUTION))
+
+    wins = sum(1 for pos in SOLUTION if SOLUTION[pos][0] == pos.turn)
+    print('%d positions, %d won and %d lost for the side to move' % (len(SOLUTION), wins, len(SOLUTION) - wins))
+    print('Start: %s wins in %d moves' % value(Position()))
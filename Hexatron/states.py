@@ -0,0 +1,350 @@
+#-----------------------------------------------------------------------------
+# Name:        AI States (states.py)
+# Purpose:     Table of every board the AI can face, built from the diagram of possible moves
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# RULES is the AI's decision tree written down as data, in the same order it
+# was checked in draw(). Each rule is:
+#
+#   (line in the AI database, white spaces, black spaces, captured pawns, moves)
+#
+# where moves maps a bead colour to the pawn and space it moves to. A move
+# written as a tuple lists fallbacks, the first pawn that isn't captured moves.
+#
+# Only one side of each rule is written down. Every rule also matches the
+# board mirrored left to right (a <-> c, pawn 1 <-> pawn 3), with its moves
+# mirrored the same way.
+#
+# The rules are only used once, on import, to fill STATES: every board the
+# computer can reach is turned to its canonical side (whichever of the board
+# and its mirror has the smaller (white, black) masks), checked against the
+# rules, and the first rule that matches is stored under the canonical masks
+# with its moves as (from, to) space numbers.
+#
+# CODES files every state a second time under the Zobrist hash of the board
+# (Position.code) and of its mirror image, with the moves already mirrored
+# for the flipped side, so choosing a move is a single dictionary lookup on
+# a number that is kept up to date as the game is played.
+#
+#-----------------------------------------------------------------------------
+
+
+from board import SQUARES, Position
+
+
+PAWNS   = ('wp1', 'wp2', 'wp3', 'bp1', 'bp2', 'bp3')
+
+START   = {'wp1' : 'a1', 'wp2' : 'b1', 'wp3' : 'c1', 'bp1' : 'a3', 'bp2' : 'b3', 'bp3' : 'c3'}
+
+FILES   = 'abc'
+
+
+# Dictionary containing the mirror image of every space and pawn
+FLIP = {'' : ''}
+
+for sp in SQUARES:
+    FLIP[sp] = FILES[-1 - FILES.index(sp[0])] + sp[1:]
+
+for pwn in PAWNS:
+    FLIP[pwn] = pwn[:2] + str(len(FILES) + 1 - int(pwn[2:]))
+
+# Index of the space each space is mirrored from
+MIRROR = tuple(SQUARES.index(FLIP[sp]) for sp in SQUARES)
+
+
+RULES = (
+
+    # Round 2 Move 1
+    (0,  'b1 c1 a2',       '',             '',             {'G' : 'bp2 a2', 'B' : 'bp2 b2', 'P' : 'bp3 c2'}),
+
+    # Round 2 Move 2
+    (1,  'a1 c1 b2',       '',             '',             {'G' : 'bp1 a2', 'B' : 'bp1 b2'}),
+
+    # Round 4 Move 1
+    (2,  'a1 c2 b2',       'a2 c3 b3',     '',             {'P' : 'bp2 c2', 'G' : 'bp3 b2'}),
+
+    # Round 4 Move 2
+    (3,  'a1 c2',          'b2 b3 c3',     'wp2',          {'G' : 'bp2 c2', 'B' : 'bp1 a1', 'P' : 'bp1 b1'}),
+
+    # Round 4 Move 3
+    (4,  'a2 c2 c1',       'b3 a3',        'bp3',          {'P' : 'bp2 a2', 'G' : 'bp2 b2', 'B' : 'bp2 c2'}),
+
+    # Round 4 Move 4
+    (5,  'c1 a2',          'a3 c3',        'bp2',          {'R' : 'bp3 c2'}),
+
+    # Round 4 Move 5 is the mirror image of Round 4 Move 1 (line 6 is no longer used)
+
+    # Round 4 Move 6
+    (7,  'b1 b2 a2',       'a3 c3',        '',             {'B' : 'bp1 b2', 'G' : 'bp3 b2', 'P' : 'bp3 c2'}),
+
+    # Round 4 Move 7
+    (8,  'c1 a2',          'b2 b3 c3',     'wp2',          {'B' : 'bp1 b1', 'R' : 'bp1 c1', 'P' : 'bp2 a2', 'G' : 'bp3 c2'}),
+
+    # Round 4 Move 8
+    (9,  'b2 c1',          'b3 c3',        'bp1',          {'P' : 'bp3 b2', 'G' : 'bp3 c2'}),
+    (9,  'b2 a1',          'b3 c3',        'bp1',          {'P' : 'bp3 b2', 'G' : 'bp3 c2'}),
+
+    # Round 4 Move 9
+    (10, 'b2 c1',          'a3 c3 a2',     'wp1',          {'R' : 'bp2 a1', 'G' : 'bp1 b2', 'B' : 'bp3 b2', 'P' : 'bp3 c2'}),
+
+    # Round 4 Move 10
+    (11, 'b1 c2',          'a3 c3 a2',     'wp1',          {'G' : 'bp2 a1', 'B' : 'bp2 b1'}),
+
+    # Round 4 Move 11
+    (12, 'b2 a1',          'b3 c3',        'wp2 bp1',      {'R' : 'bp3 b2', 'P' : 'bp3 c2'}),
+
+    # Round 6 Move 1
+    (13, 'b2 c2',          'b3 a2',        '',             {'R' : 'bp2 c2', 'P' : 'bp1 a1'}),
+
+    # Round 6 Move 2
+    (14, 'b2',             'a2 a3',        '',             {'P' : 'bp1 b2', 'R' : 'bp2 a1'}),
+
+    # Round 6 Move 3
+    (15, 'c2',             'b2 a2 a3',     '',             {'B' : 'bp2 a1', 'P' : 'bp3 b1'}),
+
+    # Round 6 Move 4
+    (16, 'a2 b2 c2',       'a3',           'bp2 bp3',      {'B' : 'bp1 b2'}),
+
+    # Round 6 Move 5
+    (17, 'a2',             'b2 c2 c3',     '',             {'R' : 'bp1 b1', 'G' : 'bp2 c1'}),
+
+    # Round 6 Move 6
+    (18, 'a2',             'b2 b3',        'wp3',          {'G' : 'bp2 a2', 'P' : ('bp1 b1', 'bp3 b1')}),
+
+    # Round 6 Move 7
+    (19, 'b2',             'a2 c3',        '',             {'P' : ('bp1 a1', 'bp2 a1'), 'R' : 'bp3 b2', 'G' : 'bp3 c2'}),
+
+    # Round 6 Move 8 is the mirror image of Round 6 Move 2 (line 20 is no longer used)
+
+    # Round 6 Move 9
+    (21, 'b2 a2',          'b3 c2',        'bp1',          {'R' : 'bp2 a2', 'P' : 'bp3 c1'}),
+
+    # Round 6 Move 10
+    (22, 'c2',             'b2 a2 c3',     'wp1',          {'P' : 'bp2 a1', 'R' : 'bp1 b1'}),
+
+    # Round 6 Move 11 is the mirror image of Round 6 Move 6 (line 23 is no longer used)
+)
+
+
+
+def mirror(squares):
+    '''Mirrors a board left to right
+
+       Parameters:
+       squares = dictionary of the spaces occupied by pawns that aren't captured
+
+       Returns:
+       Dictionary of the spaces occupied on the mirrored board
+    '''
+
+    return {FLIP[pwn] : FLIP[squares[pwn]] for pwn in squares}
+
+
+
+def fits(rule, squares):
+    '''Checks a rule against a board, without mirroring
+
+       Parameters:
+       rule    = rule from RULES
+       squares = dictionary of the spaces occupied by pawns that aren't captured
+
+       Returns:
+       Dictionary of colour to (pawn, space), or None if the rule doesn't match
+    '''
+
+    line, wSp, bSp, cap, moves = rule
+
+    white = {squares[pwn] for pwn in squares if pwn[0] == 'w'}
+    black = {squares[pwn] for pwn in squares if pwn[0] == 'b'}
+
+    if not (white.issuperset(wSp.split()) and black.issuperset(bSp.split())
+            and not squares.keys() & set(cap.split())):
+        return None
+
+    chosen = {}
+
+    for colour in moves:
+        options = moves[colour]
+
+        if isinstance(options, str):
+            options = (options,)
+
+        for option in options:
+            pwn, sp = option.split()
+
+            if pwn in squares:
+                chosen[colour] = (pwn, sp)
+                break
+
+    return chosen
+
+
+
+def match(squares):
+    '''Finds the first rule that matches a board or its mirror image
+
+       Parameters:
+       squares = dictionary of the spaces occupied by pawns that aren't captured
+
+       Returns:
+       The AI database line and moves of the rule, or None if no rule matches
+    '''
+
+    flipped = mirror(squares)
+
+    for rule in RULES:
+
+        chosen = fits(rule, squares)
+
+        if chosen is not None:
+            return rule[0], chosen
+
+        chosen = fits(rule, flipped)
+
+        if chosen is not None:
+            return rule[0], {c : (FLIP[chosen[c][0]], FLIP[chosen[c][1]]) for c in chosen}
+
+    return None
+
+
+
+def play(squares, pwn, sp):
+    '''Moves a pawn, capturing whatever was on the space it moved to
+
+       Returns:
+       New dictionary of the spaces occupied by pawns that aren't captured
+    '''
+
+    board = {p : squares[p] for p in squares if squares[p] != sp}
+    board[pwn] = sp
+
+    return board
+
+
+
+def masks(squares):
+    '''Makes the bitboard masks of a board
+
+       Parameters:
+       squares = dictionary of the spaces occupied by pawns that aren't captured
+
+       Returns:
+       (white, black) masks of the occupied spaces
+    '''
+
+    white = 0
+    black = 0
+
+    for pwn in squares:
+        if pwn[0] == 'w':
+            white |= 1 << SQUARES.index(squares[pwn])
+        else:
+            black |= 1 << SQUARES.index(squares[pwn])
+
+    return white, black
+
+
+
+def build():
+    '''Finds every board the computer can be asked to move on
+
+       The player's moves are generated from the rules of Hexapawn and the
+       computer's moves are the ones listed in RULES, starting from START.
+       Only the canonical side of each board is searched, since the moves
+       from a mirrored board are the mirrors of its moves.
+
+       Returns:
+       Dictionary of canonical (white, black) masks to (AI database line, moves)
+    '''
+
+    table = {}
+    queue = [START]
+
+    while queue:
+        board = queue.pop()
+        pawns = {SQUARES.index(board[pwn]) : pwn for pwn in board}
+
+        for frm, to in Position(*masks(board)).moves():
+            after = play(board, pawns[frm], SQUARES[to])
+            key   = masks(after)
+            flip  = mirror(after)
+
+            if masks(flip) < key:
+                after = flip
+                key   = masks(flip)
+
+            if key in table:
+                continue
+
+            found = match(after)
+            table[key] = None
+
+            if found is None:
+                continue
+
+            line, chosen = found
+            moves = {}
+
+            for colour in chosen:
+                pwn, sp = chosen[colour]
+                moves[colour] = (SQUARES.index(after[pwn]), SQUARES.index(sp))
+
+            table[key] = (line, moves)
+            over = Position(*key, turn='b').outcome()
+
+            for pwn, sp in chosen.values():
+                reply = play(after, pwn, sp)
+
+                if over is None and Position(*masks(reply)).outcome() is None:
+                    queue.append(reply)
+
+    return {key : table[key] for key in table if table[key]}
+
+
+
+STATES = build()
+
+
+
+def index(states):
+    '''Files every state under the Zobrist hashes of both sides of its board
+
+       Parameters:
+       states = dictionary of canonical (white, black) masks to (AI database line, moves)
+
+       Returns:
+       Dictionary of Zobrist hash (of the computer to move) to (AI database line, moves)
+    '''
+
+    codes = {}
+
+    for (white, black), (line, moves) in states.items():
+        pos = Position(white, black, 'b')
+
+        codes[pos.mirrored] = (line, {c : (MIRROR[moves[c][0]], MIRROR[moves[c][1]]) for c in moves})
+        codes[pos.code]     = (line, moves)
+
+    return codes
+
+
+
+CODES = index(STATES)
+
+
+
+def lookup(pos):
+    '''Finds the AI database line and moves for a position
+
+       Parameters:
+       pos = Position the computer is to move in (black's turn)
+
+       Returns:
+       (AI database line, dictionary of colour to (from, to) spaces),
+       or None if the computer has no move
+    '''
+
+    return CODES.get(pos.code)
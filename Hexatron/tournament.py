@@ -0,0 +1,200 @@
+#-----------------------------------------------------------------------------
+# Name:        AI Tournament (tournament.py)
+# Purpose:     Compares AI databases and learning rates over many games on every core
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# Every entrant is an AI database file paired with a learning rate. Each one
+# is trained from a fresh copy of its file against every fixed opponent,
+# several times with different seeds, and the AI's win rate is recorded for
+# each block of games to give a learning curve. The entrants' files are then
+# played against each other (untrained), one as black and one as white.
+#
+# Every run is independent, so they are spread over a process pool. The
+# database files are only ever read.
+#
+# Usage:
+#   python tournament.py --db "AI Default.txt" AI.txt --learning fast slow
+#                        [--opponents random first] [-n GAMES] [--repeats N]
+#                        [--block GAMES] [--workers N] [--seed N] [--csv FILE]
+#
+#-----------------------------------------------------------------------------
+
+
+import argparse
+import csv
+import os
+import random as rn
+import statistics as st
+import time as t
+
+from concurrent.futures import ProcessPoolExecutor
+
+from matchbox import MatchboxStore
+from selfplay import PLAYERS, matchboxPlayer, playGame, train
+
+
+
+def trainRun(job):
+    '''Trains one copy of an AI database against a fixed opponent
+
+       Parameters:
+       job = (database file, learning rate, opponent, games, block size, seed)
+
+       Returns:
+       (job, learning curve) where the curve is the AI's win rate in each block
+    '''
+
+    path, learning, opponent, games, block, seed = job
+
+    rng   = rn.Random(seed)
+    store = MatchboxStore(path)
+    white = PLAYERS[opponent](rng)
+    curve = []
+
+    for start in range(0, games, block):
+        stats = train(store, min(block, games - start), white, learning, rng)
+        curve.append(stats['ai'] / stats['games'])
+
+    return job, curve
+
+
+
+def duelRun(job):
+    '''Plays one AI database (black) against another (white) without learning
+
+       Parameters:
+       job = (black database file, white database file, games, seed)
+
+       Returns:
+       (job, black's win rate)
+    '''
+
+    black, white, games, seed = job
+
+    rng    = rn.Random(seed)
+    store  = MatchboxStore(black)
+    player = matchboxPlayer(MatchboxStore(white), rng)
+    won    = 0
+
+    for n in range(games):
+        if playGame(store, player, rng)[0] == 'b':
+            won += 1
+
+    return job, won / games
+
+
+
+def summary(values):
+    '''Returns the mean and standard deviation of a list of win rates'''
+
+    if len(values) > 1:
+        return st.mean(values), st.stdev(values)
+
+    return values[0], 0.0
+
+
+
+def tournament(paths, rates, opponents, games, repeats, block, workers=None, seed=0):
+    '''Runs every entrant against every opponent, and every database against each other
+
+       Parameters:
+       paths     = AI database files
+       rates     = learning rates to try with each file ('fast', 'slow')
+       opponents = names of fixed opponents from selfplay.PLAYERS
+       games     = games played in each run
+       repeats   = runs of each pairing, each with its own seed
+       block     = games per point on the learning curves
+       workers   = processes to use (every core by default)
+       seed      = seed the runs' seeds count up from
+
+       Returns:
+       (training, duels) where training maps (file, rate, opponent) to a list
+       of learning curves, and duels maps (black file, white file) to a list of win rates
+    '''
+
+    jobs  = []
+    duels = []
+    n     = seed
+
+    for path in paths:
+        for rate in rates:
+            for opponent in opponents:
+                for r in range(repeats):
+                    jobs.append((path, rate, opponent, games, block, n))
+                    n += 1
+
+    for black in paths:
+        for white in paths:
+            for r in range(repeats):
+                duels.append((black, white, games, n))
+                n += 1
+
+    training = {}
+    results  = {}
+
+    with ProcessPoolExecutor(workers) as pool:
+
+        for job, curve in pool.map(trainRun, jobs):
+            training.setdefault(job[:3], []).append(curve)
+
+        for job, rate in pool.map(duelRun, duels):
+            results.setdefault(job[:2], []).append(rate)
+
+    return training, results
+
+
+
+def main():
+    '''Runs a tournament from the command line'''
+
+    parser = argparse.ArgumentParser(description='Compare Hexatron AI databases and learning rates')
+    parser.add_argument('--db',        nargs='+', default=['AI Default.txt'],   help='AI database files to enter')
+    parser.add_argument('--learning',  nargs='+', default=['fast', 'slow'],     choices=('fast', 'slow'))
+    parser.add_argument('--opponents', nargs='+', default=sorted(PLAYERS),      choices=sorted(PLAYERS))
+    parser.add_argument('-n', '--games',  type=int, default=10000,              help='games in each run')
+    parser.add_argument('--repeats',      type=int, default=8,                  help='runs of each pairing')
+    parser.add_argument('--block',        type=int, default=500,                help='games per learning curve point')
+    parser.add_argument('--workers',      type=int, default=os.cpu_count(),     help='processes to use')
+    parser.add_argument('--seed',         type=int, default=0)
+    parser.add_argument('--csv',          help='file to write the learning curves to')
+    args = parser.parse_args()
+
+    start = t.perf_counter()
+    training, duels = tournament(args.db, args.learning, args.opponents, args.games,
+                                 args.repeats, args.block, args.workers, args.seed)
+    seconds = t.perf_counter() - start
+    played  = sum(len(c) for c in training.values()) * args.games + sum(len(d) for d in duels.values()) * args.games
+
+    print('%d games in %.2fs on %d workers (%.0f games/sec)\n' % (played, seconds, args.workers, played / seconds))
+    print('%-20s %-5s %-8s %16s %16s' % ('Database', 'Rate', 'Opponent', 'AI wins (all)', 'AI wins (last)'))
+
+    for (path, rate, opponent), curves in sorted(training.items()):
+        overall = summary([st.mean(c) for c in curves])
+        last    = summary([c[-1] for c in curves])
+        print('%-20s %-5s %-8s %9.1f%% ±%4.1f %9.1f%% ±%4.1f'
+              % (path, rate, opponent, 100 * overall[0], 100 * overall[1], 100 * last[0], 100 * last[1]))
+
+    print('\n%-20s %-20s %16s' % ('Black', 'White', 'Black wins'))
+
+    for (black, white), rates in sorted(duels.items()):
+        mean, sd = summary(rates)
+        print('%-20s %-20s %9.1f%% ±%4.1f' % (black, white, 100 * mean, 100 * sd))
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            out = csv.writer(f)
+            out.writerow(['database', 'learning', 'opponent', 'run', 'games', 'ai_win_rate'])
+
+            for (path, rate, opponent), curves in sorted(training.items()):
+                for run, curve in enumerate(curves):
+                    for i, value in enumerate(curve):
+                        out.writerow([path, rate, opponent, run, min((i + 1) * args.block, args.games), value])
+
+
+
+if __name__ == '__main__':
+    main()
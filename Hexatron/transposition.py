@@ -0,0 +1,134 @@
+#-----------------------------------------------------------------------------
+# Name:        Transposition Table (transposition.py)
+# Purpose:     Fixed-size store of results for positions, found by their Zobrist hash
+#
+# Author:      Ibrahim Haq
+# Created:     18-10-2026
+# Updated:     18-10-2026
+#-----------------------------------------------------------------------------
+#
+# The table has 2 ** bits slots. A position goes in the slot picked by the
+# low bits of its Zobrist hash (Position.code), and the whole hash is kept
+# with it so a different position landing in the same slot isn't mistaken
+# for it. When two positions want the same slot the replacement policy
+# decides which one stays:
+#
+#   always  - the newest result replaces whatever was there
+#   depth   - the result that took the bigger search to find stays (ties
+#             go to the newest)
+#   keep    - the first result stays until the table is cleared
+#
+# The table never grows, so a search of a board too big to solve completely
+# uses a known amount of memory.
+#
+#-----------------------------------------------------------------------------
+
+
+POLICIES = ('always', 'depth', 'keep')  # Replacement policies that can be chosen
+
+
+
+class TranspositionTable:
+    '''Fixed-size hash table of search results
+
+       Parameters:
+
+       bits   = the table has 2 ** bits slots
+       policy = which result stays when two positions want the same slot
+                ('always', 'depth' or 'keep')
+    '''
+
+    def __init__(self, bits=16, policy='depth'):
+
+        if policy not in POLICIES:
+            raise ValueError('unknown replacement policy %r' % policy)
+
+        self.bits   = bits
+        self.policy = policy
+        self.mask   = (1 << bits) - 1
+
+        self.clear()
+
+
+    def __len__(self):
+
+        return self.used
+
+
+    def clear(self):
+        '''Empties every slot and resets the counters'''
+
+        size = self.mask + 1
+
+        self.codes    = [None] * size       # Zobrist hash of the position in each slot
+        self.values   = [None] * size       # Result stored for it
+        self.depths   = [0] * size          # Size of the search that found it
+        self.used     = 0                   # Number of slots filled
+        self.hits     = 0                   # Lookups that found their position
+        self.misses   = 0                   # Lookups that didn't
+        self.replaced = 0                   # Results thrown out to make room for another
+
+
+    def get(self, code):
+        '''Looks up a position's result
+
+           Parameters:
+           code = Zobrist hash of the position
+
+           Returns:
+           The stored result, or None if it isn't in the table
+        '''
+
+        i = code & self.mask
+
+        if self.codes[i] == code:
+            self.hits += 1
+            return self.values[i]
+
+        self.misses += 1
+        return None
+
+
+    def put(self, code, value, depth=0):
+        '''Stores a position's result, if the replacement policy lets it in
+
+           Parameters:
+           code  = Zobrist hash of the position
+           value = result to store (anything but None)
+           depth = size of the search that found it, used by the 'depth' policy
+
+           Returns:
+           True if the result was stored
+        '''
+
+        i   = code & self.mask
+        old = self.codes[i]
+
+        if old is None:
+            self.used += 1
+
+        elif old != code:
+
+            if self.policy == 'keep' or (self.policy == 'depth' and depth < self.depths[i]):
+                return False
+
+            self.replaced += 1
+
+        self.codes[i]  = code
+        self.values[i] = value
+        self.depths[i] = depth
+
+        return True
+
+
+    def stats(self):
+        '''Returns a dictionary of how full the table is and how often lookups found their position'''
+
+        looked = self.hits + self.misses
+
+        return {'slots'    : self.mask + 1,
+                'used'     : self.used,
+                'hits'     : self.hits,
+                'misses'   : self.misses,
+                'replaced' : self.replaced,
+                'hit rate' : self.hits / looked if looked else 0.0}